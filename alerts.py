@@ -0,0 +1,371 @@
+import argparse
+import json
+import os
+import re
+import urllib.request
+from datetime import datetime
+
+"""
+Saved-search alerts: new jobs are matched against stored queries percolator-style.
+Every saved search is indexed under one anchor predicate (company, skill, keyword phrase, degree
+and/or experience year), so a job is only checked against the searches whose anchor it contains.
+"""
+
+SAVED_SEARCHES_FILE = "saved_searches.json"
+ALERTS_FILE = "alerts.jsonl"
+MAX_EXPERIENCE = 10  # extract_years_experience treats more than 10 years as Not Specified
+MAX_PHRASE_WORDS = 3  # keyword anchors are phrases of up to this many words
+
+
+def _tokens(text):
+    """
+    Lowercase words of a text, keeping "+" and "#" so c++ and c# survive
+    """
+    if not isinstance(text, str):
+        return []
+    return re.findall(r"\w[\w+#]*", text.lower())
+
+
+def _norm(value):
+    if not isinstance(value, str):
+        return ""
+    return value.strip().lower()
+
+
+class SavedSearch:
+    """
+    A stored query, all given predicates must match
+    """
+    def __init__(self, search_id, name, keywords=None, company=None, degree=None,
+                 min_experience=None, max_experience=None, skills=None, webhook=None):
+        """
+        Initialize a saved search
+
+        :param self:
+        :param search_id: Unique id
+        :param name: Display name
+        :param keywords: List of words/phrases that must all appear in the title, skills or description
+        :param company: Company name (case-insensitive)
+        :param degree: Required degree as in the CSV (e.g. "Master's")
+        :param min_experience: Minimum required years (jobs without a number don't match a range)
+        :param max_experience: Maximum required years
+        :param skills: List of skills that must all be tagged on the job
+        :param webhook: URL to POST matches to, in addition to the alerts file
+        """
+        self.search_id = search_id
+        self.name = name
+        self.keywords = [" ".join(_tokens(keyword)) for keyword in keywords or [] if _tokens(keyword)]
+        self.company = _norm(company) or None
+        self.degree = _norm(degree) or None
+        self.min_experience = min_experience
+        self.max_experience = max_experience
+        self.skills = [_norm(skill) for skill in skills or [] if _norm(skill)]
+        self.webhook = webhook
+
+    def to_dict(self):
+        return {
+            "search_id": self.search_id,
+            "name": self.name,
+            "keywords": self.keywords,
+            "company": self.company,
+            "degree": self.degree,
+            "min_experience": self.min_experience,
+            "max_experience": self.max_experience,
+            "skills": self.skills,
+            "webhook": self.webhook,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+    def has_experience_range(self):
+        return self.min_experience is not None or self.max_experience is not None
+
+    def experience_years(self):
+        """
+        Whole years covered by the experience range
+        """
+        low = self.min_experience if self.min_experience is not None else 0
+        high = self.max_experience if self.max_experience is not None else MAX_EXPERIENCE
+        return list(range(max(0, low), min(high, MAX_EXPERIENCE) + 1))
+
+    def anchor(self):
+        """
+        The predicate this search is indexed under, most selective first
+
+        :param self:
+        :return: (kind, list of values), or (None, []) if the search has no predicates
+        """
+        if self.company:
+            return "company", [self.company]
+        if self.skills:
+            return "skill", [self.skills[0]]
+        if self.keywords:
+            # Longest keyword, truncated to a phrase the job side indexes
+            keyword = max(self.keywords, key=len)
+            return "phrase", [" ".join(keyword.split()[:MAX_PHRASE_WORDS])]
+        if self.degree and self.has_experience_range():
+            return "degree_experience", [(self.degree, years) for years in self.experience_years()]
+        if self.degree:
+            return "degree", [self.degree]
+        if self.has_experience_range():
+            return "experience", self.experience_years()
+        return None, []
+
+    def matches(self, job):
+        """
+        Check all predicates against a job prepared by prepare_job
+
+        :param self:
+        :param job: dict returned by prepare_job
+        :return: True if the job matches
+        """
+        if self.company and job["company"] != self.company:
+            return False
+        if self.degree and job["degree"] != self.degree:
+            return False
+        if self.has_experience_range():
+            years = job["experience"]
+            if years is None:
+                return False
+            if self.min_experience is not None and years < self.min_experience:
+                return False
+            if self.max_experience is not None and years > self.max_experience:
+                return False
+        if any(skill not in job["skills"] for skill in self.skills):
+            return False
+        return all(f" {keyword} " in job["text"] for keyword in self.keywords)
+
+
+def prepare_job(record):
+    """
+    Normalize a job row once so every candidate search can check it cheaply
+
+    :param record: Row dict keyed by the CSV column names
+    :return: dict with the normalized fields and the original record
+    """
+    skills = [_norm(skill) for skill in str(record.get("Skills") or "").split(";") if _norm(skill)]
+    tokens = _tokens(record.get("Job Title")) + _tokens(record.get("Job Description"))
+    for skill in skills:
+        tokens += _tokens(skill)
+    try:
+        experience = int(float(record.get("Required Experience (years)")))
+    except (TypeError, ValueError):
+        experience = None
+    phrases = {
+        " ".join(tokens[i:i + length])
+        for length in range(1, MAX_PHRASE_WORDS + 1)
+        for i in range(len(tokens) - length + 1)
+    }
+    return {
+        "record": record,
+        "company": _norm(record.get("Company")),
+        "degree": _norm(record.get("Required Degree")),
+        "experience": experience,
+        "skills": set(skills),
+        "phrases": phrases,
+        "text": f" {' '.join(tokens)} ",
+    }
+
+
+class AlertIndex:
+    """
+    Inverted index from predicate values to the saved searches anchored on them
+    """
+    def __init__(self, searches):
+        """
+        Index saved searches
+
+        :param self:
+        :param searches: List of SavedSearch
+        """
+        self.searches = searches
+        self.index = {
+            "company": {}, "skill": {}, "phrase": {}, "degree_experience": {}, "degree": {}, "experience": {}
+        }
+        # Searches without predicates match every job
+        self.match_all = []
+        for position, search in enumerate(searches):
+            kind, values = search.anchor()
+            if kind is None:
+                self.match_all.append(position)
+                continue
+            for value in values:
+                self.index[kind].setdefault(value, []).append(position)
+
+    def candidates(self, job):
+        """
+        Searches whose anchor predicate is present in the job
+
+        :param self:
+        :param job: dict returned by prepare_job
+        :return: set of search positions
+        """
+        found = set(self.match_all)
+        found.update(self.index["company"].get(job["company"], ()))
+        found.update(self.index["degree_experience"].get((job["degree"], job["experience"]), ()))
+        found.update(self.index["degree"].get(job["degree"], ()))
+        found.update(self.index["experience"].get(job["experience"], ()))
+        for skill in job["skills"]:
+            found.update(self.index["skill"].get(skill, ()))
+        for phrase in job["phrases"]:
+            found.update(self.index["phrase"].get(phrase, ()))
+        return found
+
+    def match(self, records):
+        """
+        Match a batch of new jobs against all saved searches
+
+        :param self:
+        :param records: Iterable of row dicts keyed by the CSV column names
+        :return: List of (SavedSearch, record) pairs
+        """
+        matches = []
+        for record in records:
+            job = prepare_job(record)
+            for position in sorted(self.candidates(job)):
+                search = self.searches[position]
+                if search.matches(job):
+                    matches.append((search, record))
+        return matches
+
+
+class FileSink:
+    """
+    Append alerts to a JSON lines file
+    """
+    def __init__(self, alerts_file=ALERTS_FILE):
+        self.alerts_file = alerts_file
+
+    def send(self, alerts):
+        with open(self.alerts_file, "a", encoding="utf-8") as f:
+            for alert in alerts:
+                f.write(json.dumps(alert) + "\n")
+
+
+class WebhookSink:
+    """
+    POST alerts as JSON to a URL (e.g. a local endpoint standing in for chat/email)
+    """
+    def __init__(self, url, timeout=5):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, alerts):
+        body = json.dumps({"alerts": alerts}).encode("utf-8")
+        req = urllib.request.Request(
+            self.url, data=body, headers={"Content-Type": "application/json"}, method="POST"
+        )
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout):
+                pass
+        except Exception as e:
+            print(f"Could not send alerts to {self.url}: {e}")
+
+
+def load_saved_searches(searches_file=SAVED_SEARCHES_FILE):
+    """
+    Read saved searches
+
+    :param searches_file: Path to saved searches JSON
+    :return: List of SavedSearch
+    """
+    if not os.path.exists(searches_file):
+        return []
+    with open(searches_file, "r", encoding="utf-8") as f:
+        return [SavedSearch.from_dict(data) for data in json.load(f)]
+
+
+def save_saved_searches(searches, searches_file=SAVED_SEARCHES_FILE):
+    tmp_file = f"{searches_file}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump([search.to_dict() for search in searches], f, indent=2)
+    os.replace(tmp_file, searches_file)
+
+
+def add_saved_search(searches_file=SAVED_SEARCHES_FILE, **fields):
+    """
+    Store a new saved search
+
+    :param searches_file: Path to saved searches JSON
+    :param fields: SavedSearch arguments except search_id
+    :return: The new SavedSearch
+    """
+    searches = load_saved_searches(searches_file)
+    search_id = max((search.search_id for search in searches), default=0) + 1
+    search = SavedSearch(search_id, **fields)
+    searches.append(search)
+    save_saved_searches(searches, searches_file)
+    return search
+
+
+def run_alerts(new_jobs_df, searches_file=SAVED_SEARCHES_FILE, alerts_file=ALERTS_FILE):
+    """
+    Match newly ingested jobs against the saved searches and send the alerts
+
+    :param new_jobs_df: DataFrame of jobs added by this run (CSV column names, plus "Job Description" for keywords)
+    :param searches_file: Path to saved searches JSON
+    :param alerts_file: Path to the alerts file sink
+    :return: Number of alerts sent
+    """
+    searches = load_saved_searches(searches_file)
+    if not searches or new_jobs_df.empty:
+        return 0
+
+    matched_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    alerts = []
+    webhook_alerts = {}
+    for search, record in AlertIndex(searches).match(new_jobs_df.to_dict(orient="records")):
+        alert = {
+            "search_id": search.search_id,
+            "search_name": search.name,
+            "matched_at": matched_at,
+            # The description is only used for matching, alerts carry the CSV fields
+            "job": {
+                key: (None if value != value else value)
+                for key, value in record.items() if key != "Job Description"
+            },
+        }
+        alerts.append(alert)
+        if search.webhook:
+            webhook_alerts.setdefault(search.webhook, []).append(alert)
+
+    if alerts:
+        FileSink(alerts_file).send(alerts)
+    for url, url_alerts in webhook_alerts.items():
+        WebhookSink(url).send(url_alerts)
+    print(f"Sent {len(alerts)} alerts for {len(searches)} saved searches")
+    return len(alerts)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage saved job searches")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    add_parser = subparsers.add_parser("add", help="Add a saved search")
+    add_parser.add_argument("name")
+    add_parser.add_argument("--keywords", nargs="*", default=[])
+    add_parser.add_argument("--company")
+    add_parser.add_argument("--degree")
+    add_parser.add_argument("--min-experience", type=int)
+    add_parser.add_argument("--max-experience", type=int)
+    add_parser.add_argument("--skills", nargs="*", default=[])
+    add_parser.add_argument("--webhook")
+    subparsers.add_parser("list", help="List saved searches")
+    args = parser.parse_args()
+
+    if args.command == "add":
+        search = add_saved_search(
+            name=args.name,
+            keywords=args.keywords,
+            company=args.company,
+            degree=args.degree,
+            min_experience=args.min_experience,
+            max_experience=args.max_experience,
+            skills=args.skills,
+            webhook=args.webhook,
+        )
+        print(f"Saved search {search.search_id}: {search.to_dict()}")
+    else:
+        for search in load_saved_searches():
+            print(search.to_dict())
@@ -0,0 +1,380 @@
+import argparse
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+"""
+Benchmarks for the data paths used by the web server.
+Each case runs in a fresh process so peak RSS is measured per case.
+
+Usage:
+    python benchmarks.py dataset --rows 1000000
+    python benchmarks.py page --rows 100000 --requests 1000
+    python benchmarks.py skills --skills 5000 --mb 5
+    python benchmarks.py alerts --searches 10000 --jobs 500
+    python benchmarks.py imports
+"""
+
+
+def _peak_rss_mb():
+    """
+    Peak resident memory of this process in MB.
+    VmHWM is reset on exec, unlike ru_maxrss which a spawned child inherits from its parent
+    """
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss is in KB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _run_case(func, *args):
+    """
+    Run func(*args) in a spawned process and return its result dict
+    """
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(1) as pool:
+        return pool.apply(func, args)
+
+
+def make_jobs_dataframe(n_rows, seed=0):
+    """
+    Build a synthetic job table with the CSV columns and realistic cardinalities
+    """
+    import pandas as pd
+
+    rng = random.Random(seed)
+    companies = [f"Company {i}" for i in range(5000)]
+    locations = [f"City {i}, District {i % 7}" for i in range(300)] + ["Israel"]
+    degrees = ["Bachelor's", "Master's", "PhD", "Degree (Unspecified)", "Not Specified"]
+    experience = [str(i) for i in range(11)] + ["Not Specified"]
+    titles = ["Data Scientist", "Senior Data Scientist", "ML Engineer", "Data Analyst", "Applied Scientist"]
+    base = 1767000000
+    return pd.DataFrame(
+        {
+            "Job Title": [f"{rng.choice(titles)} - Team {rng.randrange(1000)}" for _ in range(n_rows)],
+            "Company": [rng.choice(companies) for _ in range(n_rows)],
+            "Location (IL)": [rng.choice(locations) for _ in range(n_rows)],
+            "Required Degree": [rng.choice(degrees) for _ in range(n_rows)],
+            "Required Experience (years)": [rng.choice(experience) for _ in range(n_rows)],
+            "Job URL": [f"https://il.linkedin.com/jobs/view/job-{4000000000 + i}" for i in range(n_rows)],
+            "Date Retrieved": [
+                time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(base + i * 30)) for i in range(n_rows)
+            ],
+        }
+    )
+
+
+def _csv_case(csv_file):
+    import pandas as pd
+
+    rss_before = _peak_rss_mb()
+    start = time.perf_counter()
+    df = pd.read_csv(csv_file)
+    load_s = time.perf_counter() - start
+    start = time.perf_counter()
+    jobs = df.to_dict(orient="records")
+    records_s = time.perf_counter() - start
+    return {
+        "case": "CSV + pandas to_dict",
+        "load_s": load_s,
+        "prepare_s": records_s,
+        "peak_rss_mb": _peak_rss_mb() - rss_before,
+        "rows": len(jobs),
+    }
+
+
+def _snapshot_case(snapshot_dir):
+    from job_store import JobStore
+
+    rss_before = _peak_rss_mb()
+    start = time.perf_counter()
+    store = JobStore.open(snapshot_dir)
+    load_s = time.perf_counter() - start
+    start = time.perf_counter()
+    # What the dashboard does: counts plus decoding every row for the table,
+    # streamed into the template rather than held as a list
+    store.unique_count("Company")
+    store.last_retrieved()
+    decoded_rows = sum(1 for _ in store.iter_rows())
+    page_s = time.perf_counter() - start
+    return {
+        "case": "mmap snapshot + iter_rows",
+        "load_s": load_s,
+        "prepare_s": page_s,
+        "peak_rss_mb": _peak_rss_mb() - rss_before,
+        "rows": len(store),
+        "encoded_mb": store.nbytes() / 2**20,
+        "decoded_rows": decoded_rows,
+    }
+
+
+def bench_dataset(n_rows):
+    """
+    Compare loading the job table from CSV with pandas against the columnar snapshot
+    """
+    from job_store import write_snapshot
+
+    print(f"Building synthetic dataset with {n_rows} rows...")
+    df = make_jobs_dataframe(n_rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_file = os.path.join(tmp, "job_listings.csv")
+        snapshot_dir = os.path.join(tmp, "job_snapshot")
+        df.to_csv(csv_file, index=False)
+        start = time.perf_counter()
+        write_snapshot(df, snapshot_dir)
+        write_s = time.perf_counter() - start
+        print(f"CSV size: {os.path.getsize(csv_file) / 2**20:.1f} MB, snapshot write: {write_s:.2f}s")
+
+        for result in (_run_case(_csv_case, csv_file), _run_case(_snapshot_case, snapshot_dir)):
+            print(
+                f"{result['case']:<32} load {result['load_s']:.3f}s  "
+                f"prepare {result['prepare_s']:.3f}s  peak RSS +{result['peak_rss_mb']:.1f} MB"
+                + (f"  encoded {result['encoded_mb']:.1f} MB" if "encoded_mb" in result else "")
+            )
+
+
+def bench_page(n_rows, n_requests):
+    """
+    Time the dashboard page: first render, cached 200 responses and 304 revalidations
+    """
+    print(f"Building synthetic dataset with {n_rows} rows...")
+    df = make_jobs_dataframe(n_rows)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        # web_server reads job_listings.csv / job_snapshot from the working directory
+        df.to_csv(os.path.join(tmp, "job_listings.csv"), index=False)
+        os.chdir(tmp)
+        try:
+            from job_store import write_snapshot
+            import web_server
+
+            write_snapshot(df)
+            client = web_server.app.test_client()
+            headers = {"Accept-Encoding": "gzip"}
+
+            start = time.perf_counter()
+            response = client.get("/", headers=headers)
+            first_s = time.perf_counter() - start
+            print(f"First render: {first_s:.3f}s, {len(response.data) / 2**20:.1f} MB gzip")
+
+            start = time.perf_counter()
+            for _ in range(n_requests):
+                client.get("/", headers=headers)
+            cached_s = time.perf_counter() - start
+
+            etag_headers = dict(headers, **{"If-None-Match": response.headers["ETag"]})
+            start = time.perf_counter()
+            for _ in range(n_requests):
+                assert client.get("/", headers=etag_headers).status_code == 304
+            not_modified_s = time.perf_counter() - start
+        finally:
+            os.chdir(cwd)
+
+    print(f"Cached 200: {n_requests / cached_s:.0f} req/s, 304: {n_requests / not_modified_s:.0f} req/s")
+
+
+def make_skills_benchmark_data(n_skills, text_mb, seed=0):
+    """
+    Build a vocabulary of n_skills (the shipped one padded with synthetic terms) and descriptions totalling text_mb
+    """
+    import json
+
+    rng = random.Random(seed)
+    with open("skills_vocabulary.json", "r", encoding="utf-8") as f:
+        vocabulary = json.load(f)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    while len(vocabulary) < n_skills:
+        term = "".join(rng.choice(letters) for _ in range(rng.randint(4, 10)))
+        vocabulary[f"{term} {len(vocabulary)}"] = [f"{term}-{len(vocabulary)}", f"{term}{len(vocabulary)}x"]
+
+    words = ["data", "team", "models", "experience", "with", "and", "the", "production", "build", "analysis",
+             "product", "we", "are", "looking", "for", "strong", "skills", "in", "years", "research"]
+    mentions = [synonym for skill, synonyms in vocabulary.items() for synonym in [skill, *synonyms]]
+    descriptions = []
+    size = 0
+    while size < text_mb * 2**20:
+        tokens = [rng.choice(mentions) if rng.random() < 0.03 else rng.choice(words) for _ in range(500)]
+        description = " ".join(tokens)
+        descriptions.append(description)
+        size += len(description)
+    return vocabulary, descriptions
+
+
+def bench_skills(n_skills, text_mb):
+    """
+    Throughput of the Aho-Corasick skill tagger against one regex per synonym
+    """
+    import re
+    from skills import SkillTagger
+
+    vocabulary, descriptions = make_skills_benchmark_data(n_skills, text_mb)
+    n_patterns = sum(1 + len(synonyms) for synonyms in vocabulary.values())
+    total_mb = sum(len(d) for d in descriptions) / 2**20
+    print(f"{len(vocabulary)} skills ({n_patterns} patterns), {len(descriptions)} descriptions, {total_mb:.1f} MB")
+
+    start = time.perf_counter()
+    tagger = SkillTagger(vocabulary)
+    print(f"Automaton build: {time.perf_counter() - start:.2f}s, {len(tagger.goto)} states")
+
+    start = time.perf_counter()
+    tagger.tag_many(descriptions)
+    ac_s = time.perf_counter() - start
+    print(f"Aho-Corasick: {total_mb / ac_s:.2f} MB/s")
+
+    patterns = [
+        (skill, re.compile(r"(?<!\w)" + re.escape(synonym.lower()) + r"(?!\w)"))
+        for skill, synonyms in vocabulary.items()
+        for synonym in [skill, *synonyms]
+    ]
+    # The regex loop is too slow for the whole corpus, time a sample
+    sample = descriptions[:max(1, len(descriptions) // 50)]
+    sample_mb = sum(len(d) for d in sample) / 2**20
+    start = time.perf_counter()
+    for description in sample:
+        text = description.lower()
+        {skill for skill, pattern in patterns if pattern.search(text)}
+    regex_s = time.perf_counter() - start
+    print(f"Regex loop: {sample_mb / regex_s:.3f} MB/s ({sample_mb:.2f} MB sample in {regex_s:.1f}s)")
+
+
+def make_saved_searches(n_searches, df, seed=0):
+    """
+    Random saved searches drawn from the values in a synthetic job table
+    """
+    from alerts import SavedSearch
+
+    rng = random.Random(seed)
+    companies = df["Company"].unique().tolist()
+    degrees = df["Required Degree"].unique().tolist()
+    searches = []
+    for search_id in range(n_searches):
+        kind = rng.random()
+        if kind < 0.6:
+            fields = {"company": rng.choice(companies), "min_experience": rng.randint(0, 5)}
+        elif kind < 0.95:
+            fields = {"keywords": [f"team {rng.randrange(1000)}"], "degree": rng.choice(degrees)}
+        else:
+            fields = {"degree": rng.choice(degrees), "min_experience": rng.randint(0, 3), "max_experience": rng.randint(3, 8)}
+        searches.append(SavedSearch(search_id, f"search {search_id}", **fields))
+    return searches
+
+
+def bench_alerts(n_searches, n_jobs):
+    """
+    Match a batch of new jobs against saved searches through the predicate index vs checking every search
+    """
+    from alerts import AlertIndex, prepare_job
+
+    df = make_jobs_dataframe(n_jobs, seed=1)
+    records = df.to_dict(orient="records")
+    searches = make_saved_searches(n_searches, df)
+
+    start = time.perf_counter()
+    index = AlertIndex(searches)
+    build_s = time.perf_counter() - start
+    start = time.perf_counter()
+    indexed = index.match(records)
+    indexed_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    naive = []
+    for record in records:
+        job = prepare_job(record)
+        naive.extend((search, record) for search in searches if search.matches(job))
+    naive_s = time.perf_counter() - start
+
+    def pairs(matches):
+        return {(search.search_id, record["Job URL"]) for search, record in matches}
+
+    assert len(indexed) == len(naive) and pairs(indexed) == pairs(naive)
+    print(f"{n_searches} saved searches, {n_jobs} new jobs, {len(indexed)} matches")
+    print(f"Index build: {build_s:.3f}s")
+    print(f"Indexed match: {indexed_s:.3f}s, every search per job: {naive_s:.3f}s")
+
+
+# Entry points and the heavy packages whose import cost is reported for them
+ENTRY_POINTS = ["web_server", "scheduler", "find_jobs"]
+HEAVY_MODULES = ["pandas", "selenium", "webdriver_manager", "bs4", "apscheduler", "pytz"]
+
+
+def _import_case(module_name, workdir):
+    import importlib
+
+    os.chdir(workdir)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    rss_before = _peak_rss_mb()
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    import_s = time.perf_counter() - start
+    result = {
+        "module": module_name,
+        "import_s": import_s,
+        "peak_rss_mb": _peak_rss_mb(),
+        "import_rss_mb": _peak_rss_mb() - rss_before,
+        "heavy": [name for name in HEAVY_MODULES if name in sys.modules],
+    }
+    if module_name == "web_server":
+        # Time until the first dashboard page is served from the snapshot
+        module.app.test_client().get("/")
+        result["first_page_s"] = time.perf_counter() - start
+        result["peak_rss_mb"] = _peak_rss_mb()
+    return result
+
+
+def bench_imports(n_rows):
+    """
+    Import time and peak memory of each entry point, and time to the first dashboard page
+    """
+    from job_store import write_snapshot
+
+    df = make_jobs_dataframe(n_rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        df.to_csv(os.path.join(tmp, "job_listings.csv"), index=False)
+        write_snapshot(df, os.path.join(tmp, "job_snapshot"))
+        for module_name in ENTRY_POINTS:
+            result = _run_case(_import_case, module_name, tmp)
+            print(
+                f"{module_name:<12} import {result['import_s']:.3f}s  "
+                f"peak RSS {result['peak_rss_mb']:.1f} MB (+{result['import_rss_mb']:.1f} MB)"
+                + (f"  first page {result['first_page_s']:.3f}s" if "first_page_s" in result else "")
+                + f"  loaded: {', '.join(result['heavy']) or '-'}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Web tier benchmarks")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+    dataset_parser = subparsers.add_parser("dataset", help="CSV/pandas vs columnar snapshot")
+    dataset_parser.add_argument("--rows", type=int, default=1_000_000)
+    page_parser = subparsers.add_parser("page", help="Dashboard render and cached response throughput")
+    page_parser.add_argument("--rows", type=int, default=100_000)
+    page_parser.add_argument("--requests", type=int, default=1000)
+    skills_parser = subparsers.add_parser("skills", help="Skill tagging throughput")
+    skills_parser.add_argument("--skills", type=int, default=5000)
+    skills_parser.add_argument("--mb", type=float, default=5)
+    alerts_parser = subparsers.add_parser("alerts", help="Saved-search matching")
+    alerts_parser.add_argument("--searches", type=int, default=10000)
+    alerts_parser.add_argument("--jobs", type=int, default=500)
+    imports_parser = subparsers.add_parser("imports", help="Entry point import time and memory")
+    imports_parser.add_argument("--rows", type=int, default=10000)
+    args = parser.parse_args()
+
+    if args.benchmark == "dataset":
+        bench_dataset(args.rows)
+    elif args.benchmark == "page":
+        bench_page(args.rows, args.requests)
+    elif args.benchmark == "skills":
+        bench_skills(args.skills, args.mb)
+    elif args.benchmark == "alerts":
+        bench_alerts(args.searches, args.jobs)
+    elif args.benchmark == "imports":
+        bench_imports(args.rows)
@@ -1,19 +1,17 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 import pandas as pd
 import time
 import random
 import re
 from datetime import datetime
 import os
+from job_store import write_snapshot, append_descriptions, CSV_LOCK, DESCRIPTIONS_FILE, SNAPSHOT_DIR
+from rollups import update_rollups, ROLLUPS_FILE
+from skills import load_skill_tagger, SKILLS_SEPARATOR
+from alerts import run_alerts
 
 """
-JobFinder: A class to scrape job listings from LinkedIn using Selenium automated browser
+JobFinder: A class to scrape job listings from LinkedIn using Selenium automated browser.
+Selenium is imported when a JobFinder is created, so importing this module doesn't load the browser stack.
 """
 
 
@@ -25,6 +23,11 @@ class JobFinder:
         :param self: 
         :param headless: if True, runs browser in headless mode (without GUI)
         """
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+        from webdriver_manager.chrome import ChromeDriverManager
+
         print("Initializing JobFinder...")
         chrome_options = Options()
         # headless - runs without GUI
@@ -45,9 +48,11 @@ class JobFinder:
         service = Service(ChromeDriverManager().install())
         self.driver = webdriver.Chrome(service=service, options=chrome_options)
         self.driver.implicitly_wait(10)
+        # Aho-Corasick automaton over the skills vocabulary, built once per JobFinder
+        self.skill_tagger = load_skill_tagger()
         print("JobFinder initialized.")
 
-    def search_jobs(self, search_term="data scientist", location="Israel", max_jobs=25):
+    def search_jobs(self, search_term="data scientist", location="Israel", max_jobs=25, posted_within=None):
         """
         Look up max jobs on LinkedIn with the giver search term and location
         
@@ -55,12 +60,18 @@ class JobFinder:
         :param search_term: Job title to search for
         :param location: Location for filtering
         :param max_jobs: Maximum num of jobs to collect
+        :param posted_within: Only jobs posted in the last this many seconds (None for any time)
         
         :return: Set of job URLs
         """
+        from selenium.webdriver.common.by import By
+
         print(f"Searching for jobs: {search_term} in {location}...")
         # Construct search url using search term and location (replace spaces with %20)
         search_url = f"https://www.linkedin.com/jobs/search/?keywords={search_term.replace(' ', '%20')}&location={location.replace(' ', '%20')}"
+        # f_TPR=r<seconds> is LinkedIn's "date posted" filter
+        if posted_within:
+            search_url += f"&f_TPR=r{int(posted_within)}"
         print(f"Search URL: {search_url}")
 
         self.driver.get(search_url)
@@ -126,6 +137,10 @@ class JobFinder:
         
         :return: job_data dictionary with title, company, location, description (all text) and URL
         """
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+
         print(f"Extracting job details from: {job_url}")
         self.driver.get(job_url)
         # Random sleep to mimic human behavior
@@ -325,7 +340,21 @@ class JobFinder:
             return "0"
         return "Not Specified"
 
-    def scrape_jobs(self, search_term="data scientist", location="Israel", max_jobs=25):
+    def extract_skills(self, job_description):
+        """
+        Find skills and technologies mentioned in the job description
+        
+        :param self:
+        :param job_description: Description extracted from URL
+        
+        :return: Skills separated by "; ", empty if none were found
+        """
+        if self.skill_tagger is None:
+            return ""
+        return SKILLS_SEPARATOR.join(self.skill_tagger.tag(job_description))
+
+    def scrape_jobs(self, search_term="data scientist", location="Israel", max_jobs=25,
+                    posted_within=None, known_urls=None):
         """
         Main function for the job scraping
         
@@ -333,13 +362,19 @@ class JobFinder:
         :param search_term: Job title
         :param location: Location to filter by
         :param max_jobs: maximum number of jobs to look for
+        :param posted_within: Only jobs posted in the last this many seconds (None for any time)
+        :param known_urls: Job URLs already stored, their pages are not visited again
         
         :return: DataFrame with job details
         """
         print("Starting job scraping...")
 
         # Get set of job listing URLs
-        job_urls = self.search_jobs(search_term, location, max_jobs)
+        job_urls = self.search_jobs(search_term, location, max_jobs, posted_within)
+        if known_urls:
+            new_urls = job_urls - set(known_urls)
+            print(f"Skipping {len(job_urls) - len(new_urls)} already stored jobs")
+            job_urls = new_urls
         if not job_urls:
             print("No jobs found.")
             return pd.DataFrame()
@@ -356,6 +391,7 @@ class JobFinder:
             job_details["experience"] = self.extract_years_experience(
                 job_details["description"]
             )
+            job_details["skills"] = self.extract_skills(job_details["description"])
 
             if job_details["location"]:
                 job_details["location"] = (
@@ -383,25 +419,135 @@ class JobFinder:
         print("Browser closed.")
 
 
-def run_job_finder_and_save(output_file="job_listings.csv", max_jobs=25):
+def write_last_run(last_run_file="last_run.txt"):
+    """
+    Record the time of the last successful run
+    """
+    with open(last_run_file, 'w') as f:
+        f.write(datetime.now().isoformat())
+    print(f"Updated {last_run_file}")
+
+
+def get_search_window(output_file="job_listings.csv", last_run_file="last_run.txt", overlap_hours=2):
+    """
+    Seconds since the last successful run plus a safety overlap, for the "date posted" search filter
+    
+    :param output_file: (str) Path to CSV file, used when last_run.txt doesn't exist
+    :param last_run_file: (str) Path to last run file
+    :param overlap_hours: Extra hours searched so postings published around the last run aren't missed
+    
+    :return: Window in seconds, or None if there was no previous run (or its time can't be read)
+    """
+    last_run_dt = None
+    if os.path.exists(last_run_file):
+        try:
+            with open(last_run_file, 'r') as f:
+                last_run_dt = datetime.fromisoformat(f.read().strip())
+        except (OSError, ValueError) as e:
+            print(f"Could not read {last_run_file}: {e}")
+    if last_run_dt is None and os.path.exists(output_file):
+        try:
+            dates = pd.to_datetime(pd.read_csv(output_file)["Date Retrieved"], errors="coerce")
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Could not read run dates from {output_file}: {e}")
+        else:
+            if dates.notna().any():
+                last_run_dt = dates.max().to_pydatetime()
+    if last_run_dt is None:
+        return None
+    elapsed = (datetime.now() - last_run_dt).total_seconds()
+    return max(0, int(elapsed)) + int(overlap_hours * 3600)
+
+
+def save_new_jobs(csv_df, retrieved_at, descriptions=None, output_file="job_listings.csv",
+                  rollups_file=ROLLUPS_FILE, snapshot_dir=SNAPSHOT_DIR, descriptions_file=DESCRIPTIONS_FILE):
+    """
+    Merge a run's jobs into the CSV, then update the snapshot, stored descriptions and rollups
+    
+    :param csv_df: DataFrame of the run's jobs with the CSV column names (may be empty)
+    :param retrieved_at: Run time string ("%Y-%m-%d %H:%M:%S")
+    :param descriptions: dict of job URL -> description
+    :param output_file: (str) Path to CSV file
+    :param rollups_file: Path to rollups JSON
+    :param snapshot_dir: Snapshot directory
+    :param descriptions_file: Path to descriptions file
+    
+    :return: DataFrame of the jobs that were not stored before
+    """
+    if csv_df.empty:
+        update_rollups(csv_df, retrieved_at, rollups_file, output_file)
+        return csv_df
+
+    # The freshness checker also rewrites the CSV, so read-modify-write under the lock
+    with CSV_LOCK:
+        # Add new jobs and don't add duplicates, ensure the path exists
+        if os.path.exists(output_file):
+            existing_df = pd.read_csv(output_file)
+            added_df = csv_df[~csv_df["Job URL"].isin(existing_df["Job URL"])]
+            combined_df = (
+                pd.concat([existing_df, csv_df])
+                .drop_duplicates(subset=["Job URL"])
+                .reset_index(drop=True)
+            )
+            print(
+                f"Appended new jobs to {output_file}. Total jobs now: {len(combined_df)}"
+            )
+        else:
+            combined_df = csv_df
+            added_df = csv_df
+            print(f"Saved new jobs to {output_file}. Total jobs: {len(csv_df)}")
+
+        # Rollups and alerts only see the jobs added by this run
+        added_df = added_df.drop_duplicates(subset=["Job URL"])
+
+        combined_df.to_csv(output_file, index=False)
+        print(f"Saved job listings to {output_file}")
+        # Columnar snapshot for the web server
+        write_snapshot(combined_df, snapshot_dir)
+        # Descriptions go to a side file, so skills can be re-tagged later without bloating the CSV
+        descriptions = descriptions or {}
+        append_descriptions({job_url: descriptions.get(job_url) for job_url in added_df["Job URL"]}, descriptions_file)
+        # Counted only once the CSV holds the jobs, so a failed run can't be counted twice
+        update_rollups(added_df, retrieved_at, rollups_file, output_file)
+    return added_df
+
+
+def run_job_finder_and_save(output_file="job_listings.csv", max_jobs=25, incremental=True, overlap_hours=2):
     """
     Run the job finder scraper and save/update the CSV file
     
     :param output_file: (str) Path to CSV file
     :param max_jobs: Max jobs to look fot
+    :param incremental: Only search postings made since the last successful run and skip stored jobs
+    :param overlap_hours: Safety overlap added to the incremental search window
+    
+    :return: Number of new jobs added, or None if the run failed
     """
     job_finder = None
     try:
+        posted_within = None
+        known_urls = None
+        if incremental:
+            posted_within = get_search_window(output_file, overlap_hours=overlap_hours)
+            if os.path.exists(output_file):
+                known_urls = set(pd.read_csv(output_file, usecols=["Job URL"])["Job URL"])
+            if posted_within:
+                print(f"Incremental run: postings from the last {posted_within / 3600:.1f} hours")
+
         # Initialize JobFinder
         job_finder = JobFinder(headless=True)
 
         new_jobs_df = job_finder.scrape_jobs(
-            search_term="data scientist", location="Israel", max_jobs=max_jobs
+            search_term="data scientist", location="Israel", max_jobs=max_jobs,
+            posted_within=posted_within, known_urls=known_urls,
         )
 
+        retrieved_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         if new_jobs_df.empty:
             print("No new jobs found.")
-            return
+            save_new_jobs(pd.DataFrame(), retrieved_at, output_file=output_file)
+            write_last_run()
+            return 0
 
         # DataFrame for CSV file
         csv_df = pd.DataFrame(
@@ -411,37 +557,29 @@ def run_job_finder_and_save(output_file="job_listings.csv", max_jobs=25):
                 "Location (IL)": new_jobs_df["location"],
                 "Required Degree": new_jobs_df["degree"],
                 "Required Experience (years)": new_jobs_df["experience"],
+                "Skills": new_jobs_df["skills"],
                 #"Job Description": new_jobs_df["description"],
                 "Job URL": new_jobs_df["job_url"],
-                "Date Retrieved": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "Date Retrieved": retrieved_at,
             }
         )
 
-        # Add new jobs and don't add duplicates, ensure the path exists
-        if os.path.exists(output_file):
-            existing_df = pd.read_csv(output_file)
-            combined_df = (
-                pd.concat([existing_df, csv_df])
-                .drop_duplicates(subset=["Job URL"])
-                .reset_index(drop=True)
-            )
-            print(
-                f"Appended new jobs to {output_file}. Total jobs now: {len(combined_df)}"
-            )
-        else:
-            combined_df = csv_df
-            print(f"Saved new jobs to {output_file}. Total jobs: {len(csv_df)}")
+        descriptions = dict(zip(new_jobs_df["job_url"], new_jobs_df["description"]))
+        added_df = save_new_jobs(csv_df, retrieved_at, descriptions, output_file)
 
-        combined_df.to_csv(output_file, index=False)
-        print(f"Saved job listings to {output_file}")
+        # Outside the lock and after saving, so failing saved searches or slow webhooks don't hold up ingestion
+        try:
+            run_alerts(added_df.assign(**{"Job Description": added_df["Job URL"].map(descriptions)}))
+        except Exception as e:
+            print(f"Could not send alerts: {e}")
         
-        with open('last_run.txt', 'w') as f:
-            f.write(datetime.now().isoformat())
-        print(f"Updated last_run.txt")
+        write_last_run()
+        return len(added_df)
     except Exception as e:
         print(f"An error occurred: {e}")
         import traceback
         traceback.print_exc()
+        return None
 
     finally:
         if job_finder:
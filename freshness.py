@@ -0,0 +1,193 @@
+import heapq
+import json
+import os
+import random
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+
+from job_store import CSV_LOCK, CLOSED_COLUMN, DATE_FORMAT, write_snapshot
+
+"""
+Freshness checks: re-verify stored postings with lightweight conditional HTTP requests and mark closed ones.
+Each cycle probes at most `budget` postings, oldest and most watched (saved-search matches) first.
+"""
+
+VERIFICATION_STATE_FILE = "verification_state.json"
+ALERTS_FILE = "alerts.jsonl"
+# Text LinkedIn shows on postings that are no longer open
+CLOSED_MARKERS = [
+    "no longer accepting applications",
+    "this job is no longer available",
+    "job is closed",
+]
+MAX_BODY_BYTES = 512 * 1024
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebkit/537.36"
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    """
+    Surface redirects as HTTPError, closed postings redirect to the search page
+    """
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+_opener = urllib.request.build_opener(_NoRedirect)
+
+
+def probe_job(job_url, state=None, timeout=10):
+    """
+    Check whether a posting is still open with one conditional GET
+
+    :param job_url: URL of the job listing
+    :param state: Validators from the previous probe ({"etag": ..., "last_modified": ...})
+    :param timeout: Request timeout in seconds
+    :return: (status, new state) where status is "live", "closed" or "unknown"
+    """
+    state = dict(state or {})
+    headers = {"User-Agent": USER_AGENT}
+    if state.get("etag"):
+        headers["If-None-Match"] = state["etag"]
+    if state.get("last_modified"):
+        headers["If-Modified-Since"] = state["last_modified"]
+
+    try:
+        with _opener.open(urllib.request.Request(job_url, headers=headers), timeout=timeout) as response:
+            body = response.read(MAX_BODY_BYTES).decode("utf-8", errors="ignore").lower()
+            state["etag"] = response.headers.get("ETag")
+            state["last_modified"] = response.headers.get("Last-Modified")
+            status = "closed" if any(marker in body for marker in CLOSED_MARKERS) else "live"
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            # Unchanged since it was last seen open
+            status = "live"
+        elif e.code in (404, 410):
+            status = "closed"
+        elif e.code in (301, 302, 303, 307, 308):
+            # Moving to another job page is fine, being sent anywhere else means the job is gone
+            location = e.headers.get("Location", "")
+            status = "live" if "/jobs/view/" in location else "closed"
+        else:
+            status = "unknown"
+    except Exception as e:
+        print(f"Could not probe {job_url}: {e}")
+        status = "unknown"
+    return status, state
+
+
+def _load_state(state_file):
+    if not os.path.exists(state_file):
+        return {}
+    with open(state_file, "r") as f:
+        return json.load(f)
+
+
+def _save_state(state, state_file):
+    tmp_file = f"{state_file}.tmp"
+    with open(tmp_file, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp_file, state_file)
+
+
+def _interest_counts(alerts_file):
+    """
+    Number of saved-search alerts per job URL
+    """
+    counts = {}
+    if not os.path.exists(alerts_file):
+        return counts
+    with open(alerts_file, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                job_url = json.loads(line)["job"]["Job URL"]
+            except (ValueError, KeyError, TypeError):
+                continue
+            counts[job_url] = counts.get(job_url, 0) + 1
+    return counts
+
+
+def pick_jobs_to_verify(jobs, state, interest, budget, now):
+    """
+    Choose the open postings to probe this cycle
+
+    :param jobs: List of (job URL, "Date Retrieved" string) for open postings
+    :param state: Verification state per URL (holds "checked_at")
+    :param interest: Saved-search alert count per URL
+    :param budget: Maximum number of postings to pick
+    :param now: Current datetime
+    :return: List of job URLs, highest priority first
+    """
+    def priority(job):
+        job_url, retrieved = job
+        last_seen = state.get(job_url, {}).get("checked_at") or retrieved
+        try:
+            hours = (now - datetime.strptime(str(last_seen)[:19], DATE_FORMAT)).total_seconds() / 3600
+        except ValueError:
+            hours = 0
+        # Stale postings first, watched ones count extra
+        return max(hours, 0) * (1 + interest.get(job_url, 0))
+
+    return [job_url for job_url, _ in heapq.nlargest(budget, jobs, key=priority)]
+
+
+def run_verification_cycle(csv_file="job_listings.csv", budget=20, delay=(1, 3),
+                           state_file=VERIFICATION_STATE_FILE, alerts_file=ALERTS_FILE):
+    """
+    Probe up to `budget` open postings and mark the closed ones in the CSV
+
+    :param csv_file: Path to CSV file
+    :param budget: Maximum number of HTTP requests this cycle
+    :param delay: (min, max) seconds to wait between probes
+    :param state_file: Path to verification state JSON
+    :param alerts_file: Path to the alerts file, used to weigh watched postings
+    :return: dict with the number of live, closed and unknown postings probed
+    """
+    import pandas as pd
+
+    if not os.path.exists(csv_file):
+        return {"live": 0, "closed": 0, "unknown": 0}
+    with CSV_LOCK:
+        df = pd.read_csv(csv_file)
+    open_df = df[df[CLOSED_COLUMN].isna()] if CLOSED_COLUMN in df.columns else df
+
+    now = datetime.now()
+    state = _load_state(state_file)
+    to_verify = pick_jobs_to_verify(
+        list(zip(open_df["Job URL"], open_df["Date Retrieved"])),
+        state, _interest_counts(alerts_file), budget, now,
+    )
+    print(f"Verifying {len(to_verify)} of {len(open_df)} open postings...")
+
+    results = {"live": 0, "closed": 0, "unknown": 0}
+    closed_urls = []
+    for i, job_url in enumerate(to_verify):
+        status, job_state = probe_job(job_url, state.get(job_url))
+        job_state["checked_at"] = datetime.now().strftime(DATE_FORMAT)
+        job_state["status"] = status
+        state[job_url] = job_state
+        results[status] += 1
+        if status == "closed":
+            closed_urls.append(job_url)
+        if delay and i < len(to_verify) - 1:
+            time.sleep(random.uniform(*delay))
+
+    if closed_urls:
+        closed_at = datetime.now().strftime(DATE_FORMAT)
+        with CSV_LOCK:
+            # Re-read, a scraper run may have appended jobs while probing
+            df = pd.read_csv(csv_file)
+            if CLOSED_COLUMN not in df.columns:
+                df[CLOSED_COLUMN] = None
+            df[CLOSED_COLUMN] = df[CLOSED_COLUMN].astype(object)
+            df.loc[df["Job URL"].isin(closed_urls) & df[CLOSED_COLUMN].isna(), CLOSED_COLUMN] = closed_at
+            df.to_csv(csv_file, index=False)
+            write_snapshot(df)
+    _save_state(state, state_file)
+    print(f"Verification done: {results}")
+    return results
+
+
+if __name__ == "__main__":
+    run_verification_cycle()
@@ -0,0 +1,589 @@
+import csv
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+"""
+JobStore: compact columnar copy of job_listings.csv for the web tier.
+
+The snapshot is a directory of .npy files that are memory-mapped on load:
+- Company, Location (IL), Required Degree: dictionary-encoded (int32 codes + category list)
+- Required Experience (years): int8, -1 for "Not Specified"
+- Date Retrieved: int64 seconds since epoch
+- Job Title, Job URL: one utf-8 blob + int64 offsets per column
+- Skills: multi-valued, int32 skill codes for all rows + int64 offsets per row
+- Date Closed: int64 seconds since epoch, 0 while the posting is open
+"""
+
+SNAPSHOT_DIR = "job_snapshot"
+# Bumped whenever the snapshot layout changes, older snapshots are rebuilt from the CSV
+SNAPSHOT_FORMAT = 2
+# Held by everything that rewrites job_listings.csv (scraper runs, freshness checks)
+CSV_LOCK = threading.Lock()
+# Serializes snapshot writes, so concurrent rebuilds don't remove each other's version directory
+SNAPSHOT_LOCK = threading.RLock()
+# Full job descriptions, kept out of the CSV (JSON lines of {"Job URL": ..., "Job Description": ...})
+DESCRIPTIONS_FILE = "job_descriptions.jsonl"
+
+CATEGORY_COLUMNS = {
+    "Company": "company",
+    "Location (IL)": "location",
+    "Required Degree": "degree",
+}
+TEXT_COLUMNS = {
+    "Job Title": "title",
+    "Job URL": "url",
+}
+SKILLS_COLUMN = "Skills"
+CLOSED_COLUMN = "Date Closed"
+NOT_SPECIFIED = "Not Specified"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+EPOCH = datetime(1970, 1, 1)
+
+
+def encode_experience(value):
+    """
+    Convert an experience cell ("3", 3, "Not Specified", NaN) to a small int
+
+    :param value: Experience value as found in the CSV
+    :return: Years as int, -1 if not specified
+    """
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return -1
+
+
+def encode_date(value):
+    """
+    Convert a "Date Retrieved" string to seconds since epoch
+
+    :param value: Date string in DATE_FORMAT
+    :return: int seconds, 0 if missing or unparsable
+    """
+    try:
+        dt = datetime.strptime(str(value)[:19], DATE_FORMAT)
+    except ValueError:
+        return 0
+    return int((dt - EPOCH).total_seconds())
+
+
+def decode_date(seconds):
+    """
+    Convert seconds since epoch back to a "Date Retrieved" string
+
+    :param seconds: int seconds since epoch
+    :return: Date string in DATE_FORMAT, empty if missing
+    """
+    return decode_dates([seconds])[0]
+
+
+def decode_dates(seconds):
+    """
+    Vectorized decode_date
+
+    :param seconds: Array of int seconds since epoch
+    :return: List of date strings in DATE_FORMAT, empty where missing
+    """
+    seconds = np.asarray(seconds, dtype=np.int64)
+    # ISO strings ("2026-01-01T12:00:00") are DATE_FORMAT with a "T" separator
+    texts = np.datetime_as_string(seconds.astype("datetime64[s]"), unit="s").tolist()
+    return [text.replace("T", " ") if value > 0 else "" for value, text in zip(seconds.tolist(), texts)]
+
+
+def _clean(value):
+    """
+    Normalize a cell to str, mapping NaN/None to an empty string
+    """
+    if value is None or value != value:
+        return ""
+    return str(value)
+
+
+def _encode_dates(values):
+    """
+    Vectorized encode_date for a pandas Series
+    """
+    import pandas as pd
+
+    dates = pd.to_datetime(values, format=DATE_FORMAT, errors="coerce")
+    return np.where(dates.isna().to_numpy(), 0, dates.to_numpy().astype("datetime64[s]").astype(np.int64))
+
+
+def split_skills(value):
+    """
+    Split a "; "-separated skills cell into skill names
+    """
+    return [skill.strip() for skill in _clean(value).split(";") if skill.strip()]
+
+
+def _encode_skills(values):
+    """
+    Dictionary-encode a multi-valued skills column
+
+    :param values: Iterable of skills cells
+    :return: (codes array, offsets array, list of skill names)
+    """
+    skill_index = {}
+    codes = []
+    offsets = [0]
+    for value in values:
+        for skill in split_skills(value):
+            if skill not in skill_index:
+                skill_index[skill] = len(skill_index)
+            codes.append(skill_index[skill])
+        offsets.append(len(codes))
+    return np.array(codes, dtype=np.int32), np.array(offsets, dtype=np.int64), list(skill_index)
+
+
+class JobStore:
+    """
+    Read-only columnar job table, rows are decoded only when accessed
+    """
+    def __init__(self, columns, categories, version=0):
+        """
+        Initialize the store from already encoded arrays
+
+        :param self:
+        :param columns: dict of array name -> numpy array (see module docstring)
+        :param categories: dict of category column key -> list of category strings
+        :param version: Data version, changes every time a snapshot is written
+        """
+        self.columns = columns
+        self.categories = categories
+        self.version = version
+
+    @classmethod
+    def from_records(cls, records, version=0):
+        """
+        Encode an iterable of row dicts keyed by the CSV column names
+
+        :param records: Iterable of dicts (e.g. DataFrame.to_dict(orient="records") or csv.DictReader)
+        :param version: Data version to attach to the store
+        :return: JobStore
+        """
+        category_index = {key: {} for key in CATEGORY_COLUMNS.values()}
+        codes = {key: [] for key in CATEGORY_COLUMNS.values()}
+        texts = {key: [] for key in TEXT_COLUMNS.values()}
+        experience = []
+        dates = []
+        closed = []
+        skills = []
+
+        for record in records:
+            for column, key in CATEGORY_COLUMNS.items():
+                value = _clean(record.get(column))
+                index = category_index[key]
+                if value not in index:
+                    index[value] = len(index)
+                codes[key].append(index[value])
+            for column, key in TEXT_COLUMNS.items():
+                texts[key].append(_clean(record.get(column)).encode("utf-8"))
+            experience.append(encode_experience(record.get("Required Experience (years)")))
+            dates.append(encode_date(record.get("Date Retrieved")))
+            closed.append(encode_date(record.get(CLOSED_COLUMN)))
+            skills.append(record.get(SKILLS_COLUMN))
+
+        columns = {}
+        for key in CATEGORY_COLUMNS.values():
+            columns[key] = np.array(codes[key], dtype=np.int32)
+        for key, values in texts.items():
+            lengths = np.fromiter((len(v) for v in values), dtype=np.int64, count=len(values))
+            offsets = np.zeros(len(values) + 1, dtype=np.int64)
+            np.cumsum(lengths, out=offsets[1:])
+            columns[f"{key}_offsets"] = offsets
+            columns[f"{key}_data"] = np.frombuffer(b"".join(values), dtype=np.uint8)
+        columns["experience"] = np.clip(np.array(experience, dtype=np.int64), -1, 127).astype(np.int8)
+        columns["date"] = np.array(dates, dtype=np.int64)
+        columns["closed"] = np.array(closed, dtype=np.int64)
+
+        categories = {key: list(index) for key, index in category_index.items()}
+        columns["skill_codes"], columns["skill_offsets"], categories["skill"] = _encode_skills(skills)
+        return cls(columns, categories, version)
+
+    @classmethod
+    def from_dataframe(cls, df, version=0):
+        """
+        Encode a DataFrame with the CSV column names
+
+        :param df: DataFrame as saved to job_listings.csv
+        :param version: Data version to attach to the store
+        :return: JobStore
+        """
+        import pandas as pd
+
+        columns = {}
+        categories = {}
+        for column, key in CATEGORY_COLUMNS.items():
+            values = df[column].fillna("").astype(str)
+            codes, uniques = pd.factorize(values)
+            columns[key] = codes.astype(np.int32)
+            categories[key] = [str(value) for value in uniques]
+        for column, key in TEXT_COLUMNS.items():
+            values = df[column].fillna("").astype(str).str.encode("utf-8")
+            lengths = np.fromiter((len(v) for v in values), dtype=np.int64, count=len(df))
+            offsets = np.zeros(len(df) + 1, dtype=np.int64)
+            np.cumsum(lengths, out=offsets[1:])
+            columns[f"{key}_offsets"] = offsets
+            columns[f"{key}_data"] = np.frombuffer(b"".join(values), dtype=np.uint8)
+
+        experience = pd.to_numeric(df["Required Experience (years)"], errors="coerce")
+        columns["experience"] = experience.fillna(-1).clip(-1, 127).to_numpy().astype(np.int8)
+        columns["date"] = _encode_dates(df["Date Retrieved"])
+        # Older CSVs have no closed column
+        columns["closed"] = (
+            _encode_dates(df[CLOSED_COLUMN]) if CLOSED_COLUMN in df.columns else np.zeros(len(df), dtype=np.int64)
+        )
+        # Older CSVs have no skills column
+        skills = df[SKILLS_COLUMN] if SKILLS_COLUMN in df.columns else [""] * len(df)
+        columns["skill_codes"], columns["skill_offsets"], categories["skill"] = _encode_skills(skills)
+        return cls(columns, categories, version)
+
+    @classmethod
+    def open(cls, snapshot_dir=SNAPSHOT_DIR):
+        """
+        Memory-map the current snapshot written by write_snapshot
+
+        :param snapshot_dir: Snapshot directory
+        :return: JobStore, or None if there is no snapshot yet
+        """
+        version_dir = _current_version_dir(snapshot_dir)
+        if version_dir is None:
+            return None
+        with open(os.path.join(version_dir, "meta.json"), "r") as f:
+            meta = json.load(f)
+        if meta.get("format") != SNAPSHOT_FORMAT:
+            return None
+        columns = {
+            name: np.load(os.path.join(version_dir, f"{name}.npy"), mmap_mode="r")
+            for name in meta["columns"]
+        }
+        return cls(columns, meta["categories"], meta["version"])
+
+    def __len__(self):
+        return len(self.columns["date"])
+
+    def category_counts(self, column):
+        """
+        Count rows per category value
+
+        :param self:
+        :param column: CSV column name of a category column (e.g. "Company")
+        :return: dict of category value -> row count
+        """
+        key = CATEGORY_COLUMNS[column]
+        counts = np.bincount(self.columns[key], minlength=len(self.categories[key]))
+        return {value: int(n) for value, n in zip(self.categories[key], counts) if n}
+
+    def unique_count(self, column):
+        """
+        Number of distinct values present in a category column
+        """
+        return len(self.category_counts(column))
+
+    def skill_counts(self):
+        """
+        Count rows per skill
+
+        :param self:
+        :return: dict of skill -> row count, most common first
+        """
+        counts = np.bincount(self.columns["skill_codes"], minlength=len(self.categories["skill"]))
+        order = np.argsort(-counts, kind="stable")
+        return {self.categories["skill"][i]: int(counts[i]) for i in order if counts[i]}
+
+    def rows_with_skill(self, skill):
+        """
+        Indices of rows tagged with a skill, in CSV order
+
+        :param self:
+        :param skill: Skill name
+        :return: numpy array of row indices
+        """
+        if skill not in self.categories["skill"]:
+            return np.array([], dtype=np.int64)
+        code = self.categories["skill"].index(skill)
+        offsets = self.columns["skill_offsets"]
+        # Row index of every skill code, then keep the rows holding the wanted one
+        row_ids = np.repeat(np.arange(len(self)), np.diff(offsets))
+        return np.unique(row_ids[self.columns["skill_codes"] == code])
+
+    def open_rows(self):
+        """
+        Indices of rows whose posting hasn't been found closed
+        """
+        return np.flatnonzero(self.columns["closed"] == 0)
+
+    def closed_count(self):
+        """
+        Number of postings marked closed
+        """
+        return int(np.count_nonzero(self.columns["closed"]))
+
+    def select_rows(self, skill=None, include_closed=False):
+        """
+        Rows matching the dashboard filters
+
+        :param self:
+        :param skill: Only rows tagged with this skill (None for any)
+        :param include_closed: Keep postings marked closed
+        :return: numpy array of row indices in CSV order, or None for all rows
+        """
+        rows = None if include_closed else self.open_rows()
+        if skill:
+            skill_rows = self.rows_with_skill(skill)
+            rows = skill_rows if rows is None else np.intersect1d(rows, skill_rows)
+        return rows
+
+    def last_retrieved(self):
+        """
+        Latest "Date Retrieved" as a string, or "N/A" when empty
+        """
+        if len(self) == 0:
+            return "N/A"
+        return decode_date(self.columns["date"].max()) or "N/A"
+
+    def _texts(self, key, rows):
+        """
+        Decode a text column for an array of rows, copying only the byte range they span
+        """
+        offsets = self.columns[f"{key}_offsets"]
+        starts = offsets[rows]
+        ends = offsets[rows + 1]
+        low = int(starts.min())
+        blob = self.columns[f"{key}_data"][low:int(ends.max())].tobytes()
+        return [blob[start - low:end - low].decode("utf-8") for start, end in zip(starts.tolist(), ends.tolist())]
+
+    def _decode_rows(self, rows):
+        """
+        Decode an array of row indices column by column, then yield them as dicts
+        """
+        columns = self.columns
+        titles = self._texts("title", rows)
+        urls = self._texts("url", rows)
+        categories = {
+            key: [self.categories[key][code] for code in columns[key][rows].tolist()]
+            for key in CATEGORY_COLUMNS.values()
+        }
+        experience = [str(years) if years >= 0 else NOT_SPECIFIED for years in columns["experience"][rows].tolist()]
+        dates = decode_dates(columns["date"][rows])
+        closed = decode_dates(columns["closed"][rows])
+        skill_names = self.categories["skill"]
+        skill_codes = columns["skill_codes"]
+        skill_starts = columns["skill_offsets"][rows].tolist()
+        skill_ends = columns["skill_offsets"][rows + 1].tolist()
+
+        for j in range(len(rows)):
+            codes = skill_codes[skill_starts[j]:skill_ends[j]].tolist()
+            yield {
+                "Job Title": titles[j],
+                "Company": categories["company"][j],
+                "Location (IL)": categories["location"][j],
+                "Required Degree": categories["degree"][j],
+                "Required Experience (years)": experience[j],
+                "Job URL": urls[j],
+                "Date Retrieved": dates[j],
+                SKILLS_COLUMN: "; ".join(skill_names[code] for code in codes),
+                CLOSED_COLUMN: closed[j],
+            }
+
+    def row(self, i):
+        """
+        Decode a single row into a dict keyed by the CSV column names
+
+        :param self:
+        :param i: Row index
+        :return: dict
+        """
+        return next(self._decode_rows(np.array([i], dtype=np.int64)))
+
+    def iter_rows(self, start=0, stop=None, rows=None, chunk_size=4096):
+        """
+        Lazily yield rows in CSV order, decoded a chunk at a time
+
+        :param self:
+        :param start: First row index
+        :param stop: Stop before this row index (None for all rows)
+        :param rows: Row indices to yield instead of a range (e.g. from rows_with_skill)
+        :param chunk_size: Number of rows decoded together
+        """
+        if rows is None:
+            stop = len(self) if stop is None else min(stop, len(self))
+            rows = np.arange(start, max(start, stop), dtype=np.int64)
+        rows = np.asarray(rows, dtype=np.int64)
+        for begin in range(0, len(rows), chunk_size):
+            yield from self._decode_rows(rows[begin:begin + chunk_size])
+
+    def nbytes(self):
+        """
+        Total size of the encoded columns in bytes
+        """
+        return sum(array.nbytes for array in self.columns.values())
+
+
+def _current_version_dir(snapshot_dir):
+    """
+    Resolve the snapshot version directory pointed to by CURRENT
+    """
+    current_file = os.path.join(snapshot_dir, "CURRENT")
+    if not os.path.exists(current_file):
+        return None
+    with open(current_file, "r") as f:
+        version_dir = os.path.join(snapshot_dir, f.read().strip())
+    return version_dir if os.path.isdir(version_dir) else None
+
+
+def _version_of(version_dir):
+    """
+    Version number of a "v<ns>" snapshot directory, None if there is none
+    """
+    if version_dir is None:
+        return None
+    try:
+        return int(os.path.basename(version_dir)[1:])
+    except ValueError:
+        return None
+
+
+def write_snapshot(df, snapshot_dir=SNAPSHOT_DIR):
+    """
+    Write a binary snapshot of the job table at ingest time.
+    Each snapshot goes to its own version directory and CURRENT is swapped atomically,
+    so readers that still have the previous version mapped are not affected.
+
+    :param df: DataFrame as saved to job_listings.csv
+    :param snapshot_dir: Snapshot directory
+    :return: JobStore for the written data
+    """
+    return _save_store(JobStore.from_dataframe(df, time.time_ns()), snapshot_dir)
+
+
+def _save_store(store, snapshot_dir):
+    """
+    Save an encoded store as a new snapshot version, see write_snapshot
+    """
+    version = store.version
+    version_name = f"v{version}"
+    version_dir = os.path.join(snapshot_dir, version_name)
+
+    with SNAPSHOT_LOCK:
+        os.makedirs(version_dir, exist_ok=True)
+        for name, array in store.columns.items():
+            np.save(os.path.join(version_dir, f"{name}.npy"), array)
+        meta = {
+            "format": SNAPSHOT_FORMAT,
+            "version": version,
+            "rows": len(store),
+            "columns": list(store.columns),
+            "categories": store.categories,
+        }
+        with open(os.path.join(version_dir, "meta.json"), "w") as f:
+            json.dump(meta, f)
+
+        # Never point CURRENT back to older data than it already has
+        current_version = _version_of(_current_version_dir(snapshot_dir))
+        if current_version is None or current_version < version:
+            tmp_file = os.path.join(snapshot_dir, "CURRENT.tmp")
+            with open(tmp_file, "w") as f:
+                f.write(version_name)
+            os.replace(tmp_file, os.path.join(snapshot_dir, "CURRENT"))
+            current_version = version
+
+        # Remove older versions, open memory maps stay valid until they are closed
+        for name in os.listdir(snapshot_dir):
+            name_version = _version_of(name) if name.startswith("v") else None
+            if name_version is not None and name_version < current_version:
+                shutil.rmtree(os.path.join(snapshot_dir, name), ignore_errors=True)
+
+    print(f"Wrote job snapshot {version_name} ({len(store)} rows) to {snapshot_dir}")
+    return store
+
+
+def _build_store(csv_file):
+    """
+    Encode the CSV into a store, versioned with the time the CSV was read
+    """
+    version = time.time_ns()
+    try:
+        import pandas as pd
+    except ImportError:
+        # Read-only dashboards may run without pandas, encode the CSV row by row instead
+        with open(csv_file, "r", newline="", encoding="utf-8") as f:
+            return JobStore.from_records(csv.DictReader(f), version)
+    return JobStore.from_dataframe(pd.read_csv(csv_file), version)
+
+
+def load_job_store(csv_file="job_listings.csv", snapshot_dir=SNAPSHOT_DIR, current=None, persist=True):
+    """
+    Open the snapshot, building it from the CSV when it is missing or older than the CSV
+
+    :param csv_file: Path to CSV file
+    :param snapshot_dir: Snapshot directory
+    :param current: Store returned by a previous call, reused if the snapshot hasn't changed
+    :param persist: Write the rebuilt store as the new snapshot, read-only dashboards keep it in memory only
+    :return: JobStore, or None if there is no data at all
+    """
+    csv_mtime = os.path.getmtime(csv_file) if os.path.exists(csv_file) else None
+
+    def open_fresh():
+        version = _version_of(_current_version_dir(snapshot_dir))
+        if version is None or (csv_mtime is not None and version < csv_mtime * 1e9):
+            return None
+        if current is not None and current.version == version:
+            return current
+        return JobStore.open(snapshot_dir)
+
+    store = open_fresh()
+    if store is not None:
+        return store
+    if csv_mtime is None:
+        return None
+    if not persist:
+        if current is not None and current.version >= csv_mtime * 1e9:
+            return current
+        return _build_store(csv_file)
+
+    with SNAPSHOT_LOCK:
+        # Another request may have rebuilt it while this one was waiting
+        store = open_fresh()
+        if store is not None:
+            return store
+        return _save_store(_build_store(csv_file), snapshot_dir)
+
+
+def append_descriptions(descriptions, descriptions_file=DESCRIPTIONS_FILE):
+    """
+    Store the descriptions of newly added jobs
+
+    :param descriptions: dict of job URL -> description
+    :param descriptions_file: Path to descriptions JSON lines file
+    """
+    with open(descriptions_file, "a", encoding="utf-8") as f:
+        for job_url, description in descriptions.items():
+            if isinstance(description, str) and description:
+                f.write(json.dumps({"Job URL": job_url, "Job Description": description}) + "\n")
+
+
+def load_descriptions(descriptions_file=DESCRIPTIONS_FILE):
+    """
+    Read stored descriptions, the latest one wins if a job was stored twice
+
+    :param descriptions_file: Path to descriptions JSON lines file
+    :return: dict of job URL -> description
+    """
+    descriptions = {}
+    if not os.path.exists(descriptions_file):
+        return descriptions
+    with open(descriptions_file, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+                descriptions[entry["Job URL"]] = entry["Job Description"]
+            except (ValueError, KeyError, TypeError):
+                continue
+    return descriptions
@@ -0,0 +1,249 @@
+import csv
+import json
+import os
+
+"""
+JobRollups: aggregate counts over the job history, updated incrementally with each batch of new jobs.
+Stored as JSON next to the CSV, so reading the stats never touches the job rows.
+"""
+
+ROLLUPS_FILE = "job_rollups.json"
+
+# Rollup name -> CSV column
+DIMENSIONS = {
+    "company": "Company",
+    "location": "Location (IL)",
+    "degree": "Required Degree",
+}
+EXPERIENCE_BUCKETS = [(0, 1, "0-1"), (2, 3, "2-3"), (4, 5, "4-5"), (6, 10, "6+")]
+
+
+def experience_bucket(value):
+    """
+    Map an experience cell to its bucket label
+
+    :param value: Experience value as found in the CSV ("3", 3, "Not Specified", NaN)
+    :return: Bucket label, "Not Specified" if not a number
+    """
+    try:
+        years = int(float(value))
+    except (TypeError, ValueError):
+        return "Not Specified"
+    for low, high, label in EXPERIENCE_BUCKETS:
+        if low <= years <= high:
+            return label
+    return EXPERIENCE_BUCKETS[-1][2]
+
+
+def _label(value):
+    """
+    Normalize a cell to a rollup key
+    """
+    if value is None or value != value or value == "":
+        return "Unknown"
+    return str(value)
+
+
+class JobRollups:
+    """
+    Counts by company, location, degree, experience bucket and retrieval day, plus new jobs per run
+    """
+    def __init__(self, total_jobs=0, counts=None, runs=None):
+        """
+        Initialize rollups
+
+        :param self:
+        :param total_jobs: Number of jobs counted so far
+        :param counts: dict of rollup name -> {value: count}
+        :param runs: list of {"run": date string, "new_jobs": int, "total_jobs": int}
+        """
+        self.total_jobs = total_jobs
+        self.counts = counts or {name: {} for name in [*DIMENSIONS, "experience", "day"]}
+        self.runs = runs or []
+
+    def add_jobs(self, records):
+        """
+        Count a batch of jobs that were not seen before
+
+        :param self:
+        :param records: Iterable of row dicts keyed by the CSV column names
+        :return: Number of jobs added
+        """
+        added = 0
+        for record in records:
+            for name, column in DIMENSIONS.items():
+                key = _label(record.get(column))
+                self.counts[name][key] = self.counts[name].get(key, 0) + 1
+            bucket = experience_bucket(record.get("Required Experience (years)"))
+            self.counts["experience"][bucket] = self.counts["experience"].get(bucket, 0) + 1
+            day = _label(record.get("Date Retrieved"))[:10]
+            self.counts["day"][day] = self.counts["day"].get(day, 0) + 1
+            added += 1
+        self.total_jobs += added
+        return added
+
+    def record_run(self, run_time, new_jobs):
+        """
+        Append a point to the new-postings-per-run trend
+
+        :param self:
+        :param run_time: Run time string ("%Y-%m-%d %H:%M:%S")
+        :param new_jobs: Number of new jobs found by the run
+        """
+        self.runs.append({"run": run_time, "new_jobs": new_jobs, "total_jobs": self.total_jobs})
+
+    def to_dict(self):
+        return {"total_jobs": self.total_jobs, "counts": self.counts, "runs": self.runs}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["total_jobs"], data["counts"], data["runs"])
+
+    @classmethod
+    def from_dataframe(cls, df):
+        """
+        Full recompute from the whole job table. Used only to bootstrap and to verify the incremental rollups.
+        Every run stamps its jobs with the same "Date Retrieved", so runs are rebuilt from those groups.
+
+        :param df: DataFrame as saved to job_listings.csv
+        :return: JobRollups
+        """
+        rollups = cls()
+        if df.empty:
+            return rollups
+        for run_time, run_df in df.groupby("Date Retrieved", sort=True):
+            new_jobs = rollups.add_jobs(run_df.to_dict(orient="records"))
+            rollups.record_run(str(run_time), new_jobs)
+        return rollups
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        Same as from_dataframe for row dicts (e.g. csv.DictReader), for when pandas is not installed
+
+        :param records: Iterable of row dicts keyed by the CSV column names
+        :return: JobRollups
+        """
+        runs = {}
+        for record in records:
+            # Rows without a retrieval date belong to no run, as with groupby
+            if record.get("Date Retrieved"):
+                runs.setdefault(record["Date Retrieved"], []).append(record)
+        rollups = cls()
+        for run_time in sorted(runs):
+            new_jobs = rollups.add_jobs(runs[run_time])
+            rollups.record_run(run_time, new_jobs)
+        return rollups
+
+    def save(self, rollups_file=ROLLUPS_FILE):
+        """
+        Write rollups atomically
+
+        :param self:
+        :param rollups_file: Path to rollups JSON
+        """
+        tmp_file = f"{rollups_file}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_file, rollups_file)
+
+    @classmethod
+    def load(cls, rollups_file=ROLLUPS_FILE):
+        """
+        Read rollups from JSON
+
+        :param rollups_file: Path to rollups JSON
+        :return: JobRollups, or None if the file doesn't exist
+        """
+        if not os.path.exists(rollups_file):
+            return None
+        with open(rollups_file, "r") as f:
+            return cls.from_dict(json.load(f))
+
+
+def load_rollups(rollups_file=ROLLUPS_FILE, csv_file="job_listings.csv", persist=True):
+    """
+    Load rollups, bootstrapping them once from the CSV if they don't exist yet
+
+    :param rollups_file: Path to rollups JSON
+    :param csv_file: Path to CSV file
+    :param persist: Save bootstrapped rollups, read-only dashboards leave the file to the scraper
+    :return: JobRollups
+    """
+    rollups = JobRollups.load(rollups_file)
+    if rollups is not None:
+        return rollups
+    if os.path.exists(csv_file):
+        print(f"Building rollups from {csv_file}...")
+        try:
+            import pandas as pd
+        except ImportError:
+            with open(csv_file, "r", newline="", encoding="utf-8") as f:
+                rollups = JobRollups.from_records(csv.DictReader(f))
+        else:
+            rollups = JobRollups.from_dataframe(pd.read_csv(csv_file))
+    else:
+        rollups = JobRollups()
+    if persist:
+        rollups.save(rollups_file)
+    return rollups
+
+
+def update_rollups(new_jobs_df, run_time, rollups_file=ROLLUPS_FILE, csv_file="job_listings.csv"):
+    """
+    Add only the newly ingested jobs to the rollups and record the run
+
+    :param new_jobs_df: DataFrame of jobs not seen before (CSV column names)
+    :param run_time: Run time string ("%Y-%m-%d %H:%M:%S")
+    :param rollups_file: Path to rollups JSON
+    :param csv_file: Path to CSV file, used only if the rollups have to be bootstrapped
+    :return: JobRollups
+    """
+    # Call this after the CSV is written, a bootstrap then already counts this run
+    rollups = load_rollups(rollups_file, csv_file)
+    if any(run["run"] == run_time for run in rollups.runs):
+        return rollups
+    new_jobs = rollups.add_jobs(new_jobs_df.to_dict(orient="records"))
+    rollups.record_run(run_time, new_jobs)
+    rollups.save(rollups_file)
+    print(f"Updated {rollups_file} with {new_jobs} new jobs")
+    return rollups
+
+
+def verify_rollups(rollups_file=ROLLUPS_FILE, csv_file="job_listings.csv"):
+    """
+    Compare the incremental rollups with a full recompute from the CSV
+
+    :param rollups_file: Path to rollups JSON
+    :param csv_file: Path to CSV file
+    :return: List of mismatch descriptions, empty if they agree
+    """
+    import pandas as pd
+
+    rollups = JobRollups.load(rollups_file)
+    if rollups is None:
+        return [f"{rollups_file} not found"]
+    expected = JobRollups.from_dataframe(pd.read_csv(csv_file))
+
+    mismatches = []
+    if rollups.total_jobs != expected.total_jobs:
+        mismatches.append(f"total_jobs: {rollups.total_jobs} != {expected.total_jobs}")
+    for name, counts in expected.counts.items():
+        if rollups.counts.get(name) != counts:
+            mismatches.append(f"counts[{name}] differ")
+    # Runs that found nothing leave no rows behind, so only compare runs with new jobs
+    actual_runs = {run["run"]: run["new_jobs"] for run in rollups.runs if run["new_jobs"]}
+    expected_runs = {run["run"]: run["new_jobs"] for run in expected.runs}
+    if actual_runs != expected_runs:
+        mismatches.append("runs differ")
+    return mismatches
+
+
+if __name__ == "__main__":
+    problems = verify_rollups()
+    if problems:
+        print("Rollups do not match a full recompute:")
+        for problem in problems:
+            print(f"- {problem}")
+    else:
+        print("Rollups match a full recompute.")
@@ -1,23 +1,63 @@
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.interval import IntervalTrigger
 from datetime import datetime, timedelta
-import pytz
-from find_jobs import run_job_finder_and_save
+import json
+import os
+
+# APScheduler and the scraping modules are imported when a scheduler is created or a run starts,
+# so reading the schedule (e.g. from a read-only dashboard) stays cheap
+
+SCHEDULE_FILE = "schedule.json"
+
+
+def load_schedule(schedule_file=SCHEDULE_FILE):
+    """
+    Read the persisted schedule
+
+    :param schedule_file: Path to schedule JSON
+    :return: dict with "interval" (hours) and "next_run" (datetime or None), or None if there is no schedule yet
+    """
+    if not os.path.exists(schedule_file):
+        return None
+    with open(schedule_file, 'r') as f:
+        schedule = json.load(f)
+    schedule["next_run"] = datetime.fromisoformat(schedule["next_run"]) if schedule.get("next_run") else None
+    return schedule
+
 
 class JobFinderScheduler:
     """
-    Automatic job scraping every 12/24 hours
+    Automatic job scraping, the interval adapts to how many new jobs each run finds
     """
-    def __init__(self, interval=0.5):
+    def __init__(self, interval=0.5, verify_interval=1, verify_budget=20,
+                 min_interval=2, max_interval=24, target_new_jobs=15, schedule_file=SCHEDULE_FILE):
         """
         Initialize scheduler
         
         :param self: 
-        :param interval: Interval (hours, int) between job scraping (12/24)
+        :param interval: Starting interval (hours) between job scraping, replaced by the persisted adaptive interval
+        :param verify_interval: Interval (hours) between freshness checks of stored postings
+        :param verify_budget: Max number of postings probed per freshness check
+        :param min_interval: Shortest interval (hours) when many new jobs appear
+        :param max_interval: Longest interval (hours) when it's quiet
+        :param target_new_jobs: Number of new jobs a run should find on average
+        :param schedule_file: Path to schedule JSON (adaptive interval and next run time)
         """
+        from apscheduler.schedulers.background import BackgroundScheduler
+        import pytz
+
         self.interval = interval
+        self.verify_interval = verify_interval
+        self.verify_budget = verify_budget
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_new_jobs = target_new_jobs
+        self.schedule_file = schedule_file
         self.scheduler = BackgroundScheduler(timezone=pytz.timezone('Asia/Jerusalem'))
         self.next_run = None
+
+        schedule = load_schedule(schedule_file)
+        if schedule:
+            self.interval = schedule["interval"]
+            self.next_run = schedule["next_run"]
         
     def find_jobs(self):
         """
@@ -25,21 +65,77 @@ class JobFinderScheduler:
         
         :param self:
         """
+        from apscheduler.triggers.interval import IntervalTrigger
+        from find_jobs import run_job_finder_and_save, get_search_window
+
         print(f"\n{'='*50}")
         print(f"Automatic job-finding started at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"{'='*50}\n")
         
-        run_job_finder_and_save(max_jobs=50)
-        
-        with open('last_run.txt', 'w') as f:
-            f.write(datetime.now().isoformat())
+        # Hours since the last successful run, the period the run's new postings appeared in
+        # (the search adds an overlap on top, but postings from it are already stored)
+        window = get_search_window(overlap_hours=0)
+        hours = window / 3600 if window is not None else self.interval
+        new_jobs = run_job_finder_and_save(max_jobs=50)
+        self.adapt_interval(new_jobs, hours)
         
         self.next_run = datetime.now() + timedelta(hours=self.interval)
+        if self.scheduler.get_job('jobfinder_linkedin'):
+            self.scheduler.reschedule_job('jobfinder_linkedin', trigger=IntervalTrigger(hours=self.interval))
+        self.save_schedule()
         
         print(f"\n{'='*50}")
         print(f"Next job-finding will begin at {self.next_run.strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"{'='*50}\n")
         
+    def adapt_interval(self, new_jobs, hours):
+        """
+        Run more often when many new jobs appear and back off when it's quiet
+        
+        :param self:
+        :param new_jobs: New jobs found by the last run (None if it failed)
+        :param hours: Hours since the previous successful run
+        """
+        if new_jobs is None:
+            return
+        if new_jobs == 0:
+            # Back off by 1.5x on every empty run
+            interval = self.interval * 1.5
+        else:
+            # Interval at which a run would find about target_new_jobs at the observed rate
+            rate = new_jobs / max(hours, 0.1)
+            ideal = self.target_new_jobs / rate
+            # Smooth so a single busy run doesn't swing the schedule
+            interval = 0.5 * self.interval + 0.5 * ideal
+        self.interval = round(min(self.max_interval, max(self.min_interval, interval)), 2)
+        print(f"Found {new_jobs} new jobs in {hours:.1f} hours, interval is now {self.interval} hours")
+
+    def save_schedule(self):
+        """
+        Persist the adaptive interval and next run time (read by the dashboard)
+        
+        :param self:
+        """
+        schedule = {
+            "interval": self.interval,
+            "next_run": self.next_run.isoformat() if self.next_run else None,
+        }
+        tmp_file = f"{self.schedule_file}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(schedule, f)
+        os.replace(tmp_file, self.schedule_file)
+
+    def verify_jobs(self):
+        """
+        Re-check stored postings and mark closed ones
+        
+        :param self:
+        """
+        from freshness import run_verification_cycle
+
+        print(f"Freshness check started at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        run_verification_cycle(budget=self.verify_budget)
+
     def start(self, run_on_init=True):
         """
         Start the scheduler
@@ -47,19 +143,30 @@ class JobFinderScheduler:
         :param self: 
         :param run_on_init: If true, will run the scraper immediately
         """
-        
+        from apscheduler.triggers.interval import IntervalTrigger
+
+        # Resume a persisted schedule if its next run is still ahead
+        first_run = None
+        if not run_on_init and self.next_run and self.next_run > datetime.now():
+            first_run = self.next_run
         self.scheduler.add_job(func=self.find_jobs,
-                               trigger=IntervalTrigger(hours=self.interval),
+                               trigger=IntervalTrigger(hours=self.interval, start_date=first_run),
                                id='jobfinder_linkedin',
                                name='JobFinder LinkedIn',
                                replace_existing=True)
+        self.scheduler.add_job(func=self.verify_jobs,
+                               trigger=IntervalTrigger(hours=self.verify_interval),
+                               id='jobfinder_verify',
+                               name='JobFinder freshness check',
+                               replace_existing=True)
         self.scheduler.start()
-        print(f"Scheduler has started and will run every {self.interval} hours")
+        print(f"Scheduler has started and will run every {self.interval} hours, adapting to new job volume")
         
         if run_on_init:
             self.find_jobs()
         else:
-            self.next_run = datetime.now() + timedelta(hours=self.interval)
+            self.next_run = first_run or datetime.now() + timedelta(hours=self.interval)
+            self.save_schedule()
             print(f"First run scheduled for {self.next_run.strftime('%Y-%m-%d %H:%M:%S')}")
             
     def stop(self):
@@ -0,0 +1,168 @@
+import json
+import os
+from collections import deque
+
+"""
+SkillTagger: tag job descriptions with skills using an Aho-Corasick automaton.
+All skill synonyms are matched in a single pass over the text, regardless of vocabulary size.
+"""
+
+VOCABULARY_FILE = "skills_vocabulary.json"
+SKILLS_SEPARATOR = "; "
+# Vocabulary key listing skills matched only through their synonyms (e.g. "R" would match "R&D")
+NO_BARE_NAME_KEY = "_no_bare_name"
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == "_"
+
+
+class SkillTagger:
+    """
+    Multi-pattern matcher over a vocabulary of skill -> synonyms
+    """
+    def __init__(self, vocabulary):
+        """
+        Build the automaton
+
+        :param self:
+        :param vocabulary: dict of canonical skill name -> list of synonyms. The name itself is matched too,
+            unless it is listed under the "_no_bare_name" key
+        """
+        no_bare_name = set(vocabulary.get(NO_BARE_NAME_KEY, []))
+        self.skills = [skill for skill in vocabulary if skill != NO_BARE_NAME_KEY]
+        # goto[state] maps a character to the next state, out[state] holds (pattern length, skill id)
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+
+        for skill_id, skill in enumerate(self.skills):
+            patterns = set(vocabulary[skill]) if skill in no_bare_name else {skill, *vocabulary[skill]}
+            for synonym in patterns:
+                self._add_pattern(synonym.lower().strip(), skill_id)
+        self._build_fail_links()
+
+    @classmethod
+    def from_file(cls, vocabulary_file=VOCABULARY_FILE):
+        """
+        Load the vocabulary from a JSON file of {"skill": ["synonym", ...]}
+
+        :param vocabulary_file: Path to vocabulary JSON
+        :return: SkillTagger
+        """
+        with open(vocabulary_file, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def _add_pattern(self, pattern, skill_id):
+        if not pattern:
+            return
+        state = 0
+        for char in pattern:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+            state = next_state
+        self.out[state].append((len(pattern), skill_id))
+
+    def _build_fail_links(self):
+        # Breadth-first, so the fail state of each node is final before its children are visited
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fail_state = self.fail[state]
+                while fail_state and char not in self.goto[fail_state]:
+                    fail_state = self.fail[fail_state]
+                self.fail[next_state] = self.goto[fail_state].get(char, 0)
+                # Merge outputs so matching never has to walk fail links
+                self.out[next_state] = self.out[next_state] + self.out[self.fail[next_state]]
+
+    def tag(self, text):
+        """
+        Find all skills mentioned in the text, matching whole words only
+
+        :param self:
+        :param text: Job description
+        :return: List of canonical skill names in order of first mention
+        """
+        if not isinstance(text, str) or not text:
+            return []
+        text = text.lower()
+        goto, fail, out = self.goto, self.fail, self.out
+        found = {}
+        state = 0
+        for end, char in enumerate(text, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not out[state]:
+                continue
+            for length, skill_id in out[state]:
+                if skill_id in found:
+                    continue
+                start = end - length
+                # Word boundaries: "r" must not match inside "python"
+                if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(text[start]):
+                    continue
+                if end < len(text) and _is_word_char(text[end]) and _is_word_char(text[end - 1]):
+                    continue
+                found[skill_id] = start
+        return [self.skills[skill_id] for skill_id in sorted(found, key=found.get)]
+
+    def tag_many(self, texts):
+        """
+        Tag a batch of descriptions
+
+        :param self:
+        :param texts: Iterable of job descriptions
+        :return: List of "; "-joined skill strings, one per text
+        """
+        return [SKILLS_SEPARATOR.join(self.tag(text)) for text in texts]
+
+
+def load_skill_tagger(vocabulary_file=VOCABULARY_FILE):
+    """
+    Load the tagger, or None if the vocabulary file is missing
+    """
+    if not os.path.exists(vocabulary_file):
+        print(f"Skills vocabulary {vocabulary_file} not found, skipping skills tagging.")
+        return None
+    return SkillTagger.from_file(vocabulary_file)
+
+
+def tag_jobs_csv(csv_file="job_listings.csv", vocabulary_file=VOCABULARY_FILE, descriptions_file=None):
+    """
+    Re-tag all stored jobs in batch from their stored descriptions, e.g. after the vocabulary changed.
+    Jobs without a stored description keep their skills.
+
+    :param csv_file: Path to CSV file
+    :param vocabulary_file: Path to vocabulary JSON
+    :param descriptions_file: Path to descriptions file (job_store.DESCRIPTIONS_FILE by default)
+    :return: Number of jobs re-tagged
+    """
+    import pandas as pd
+    from job_store import CSV_LOCK, DESCRIPTIONS_FILE, load_descriptions, write_snapshot
+
+    tagger = SkillTagger.from_file(vocabulary_file)
+    descriptions = load_descriptions(descriptions_file or DESCRIPTIONS_FILE)
+    with CSV_LOCK:
+        df = pd.read_csv(csv_file)
+        if "Skills" not in df.columns:
+            df["Skills"] = ""
+        df["Skills"] = df["Skills"].astype(object)
+        texts = df["Job URL"].map(descriptions)
+        has_text = texts.notna()
+        df.loc[has_text, "Skills"] = tagger.tag_many(texts[has_text])
+        df.to_csv(csv_file, index=False)
+        write_snapshot(df)
+    print(f"Re-tagged {int(has_text.sum())} of {len(df)} jobs in {csv_file} from stored descriptions")
+    return int(has_text.sum())
+
+
+if __name__ == "__main__":
+    tag_jobs_csv()
@@ -0,0 +1,116 @@
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+"""
+Local stand-in for LinkedIn job pages, to exercise freshness.py without touching the real site.
+Paths are /jobs/view/<kind>-<id> where kind is:
+- live: 200 with an ETag, 304 when the ETag matches
+- closed: 200 page saying the job no longer accepts applications
+- gone: 410
+- expired: 302 to the search page
+- moved: 301 to the live page of the same id
+"""
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests.append((self.path, dict(self.headers)))
+        name = self.path.rstrip("/").rsplit("/", 1)[-1]
+        kind, _, job_id = name.partition("-")
+
+        if kind == "live":
+            etag = f'"live-{job_id}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            self._send_page(200, f"<h1>Data Scientist {job_id}</h1><button>Apply</button>", etag)
+        elif kind == "closed":
+            self._send_page(200, f"<h1>Data Scientist {job_id}</h1><p>No longer accepting applications</p>")
+        elif kind == "gone":
+            self._send_page(410, "Gone")
+        elif kind == "expired":
+            self._redirect(302, "/jobs/search/?keywords=data%20scientist")
+        elif kind == "moved":
+            self._redirect(301, f"/jobs/view/live-{job_id}")
+        else:
+            self._send_page(404, "Not found")
+
+    def send_response(self, code, message=None):
+        self.server.responses.append((self.path, code))
+        super().send_response(code, message)
+
+    def _send_page(self, code, body, etag=None):
+        data = f"<html><body>{body}</body></html>".encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(data)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _redirect(self, code, location):
+        self.send_response(code)
+        self.send_header("Location", location)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stand_in_server(port=0):
+    """
+    Start the stand-in server in a background thread
+
+    :param port: Port to listen on (0 picks a free one)
+    :return: (server, base URL). server.requests holds (path, headers) and server.responses (path, status code)
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), StandInHandler)
+    server.requests = []
+    server.responses = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def demo():
+    """
+    Run two verification cycles against the stand-in with a throwaway CSV
+    """
+    import pandas as pd
+    from freshness import run_verification_cycle
+
+    server, base_url = start_stand_in_server()
+    kinds = ["live", "closed", "gone", "expired", "moved", "live"]
+    df = pd.DataFrame(
+        {
+            "Job Title": [f"Data Scientist {i}" for i in range(len(kinds))],
+            "Company": "Stand-in",
+            "Location (IL)": "Israel",
+            "Required Degree": "Not Specified",
+            "Required Experience (years)": "Not Specified",
+            "Job URL": [f"{base_url}/jobs/view/{kind}-{i}" for i, kind in enumerate(kinds)],
+            "Date Retrieved": [f"2026-01-0{i + 1} 12:00:00" for i in range(len(kinds))],
+        }
+    )
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            df.to_csv("job_listings.csv", index=False)
+            run_verification_cycle(budget=4, delay=None)
+            run_verification_cycle(budget=4, delay=None)
+            print(pd.read_csv("job_listings.csv")[["Job URL", "Date Closed"]].to_string(index=False))
+        finally:
+            os.chdir(cwd)
+    conditional = sum(1 for _, headers in server.requests if "If-None-Match" in headers)
+    print(f"{len(server.requests)} requests, {conditional} conditional")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    demo()
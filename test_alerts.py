@@ -0,0 +1,81 @@
+import pytest
+
+from alerts import AlertIndex, SavedSearch, prepare_job
+
+"""
+The saved-search index must find exactly the matches of checking every search against every job.
+"""
+
+
+def job(i, **fields):
+    record = {
+        "Job Title": "Data Scientist",
+        "Company": "Acme",
+        "Location (IL)": "Tel Aviv",
+        "Required Degree": "Master's",
+        "Required Experience (years)": "3",
+        "Skills": "Python; SQL",
+        "Job Description": "Build machine learning models for fraud detection",
+        "Job URL": f"https://il.linkedin.com/jobs/view/{i}",
+    }
+    record.update(fields)
+    return record
+
+
+JOBS = [
+    job(0),
+    job(1, **{"Company": "Globex", "Skills": "Spark", "Required Experience (years)": "5"}),
+    job(2, **{"Required Degree": "PhD", "Required Experience (years)": "Not Specified"}),
+    job(3, **{"Job Title": "NLP Researcher", "Job Description": "Large language models", "Skills": ""}),
+    job(4, **{"Required Degree": "Bachelor's", "Required Experience (years)": "1", "Job Description": None}),
+    job(5, **{"Company": "acme ", "Required Experience (years)": "8"}),
+]
+
+
+def brute_force(searches, records):
+    matches = set()
+    for record in records:
+        prepared = prepare_job(record)
+        matches.update((search.search_id, record["Job URL"]) for search in searches if search.matches(prepared))
+    return matches
+
+
+def indexed(searches, records):
+    return {(search.search_id, record["Job URL"]) for search, record in AlertIndex(searches).match(records)}
+
+
+@pytest.mark.parametrize(
+    "kind, fields, expected_jobs",
+    [
+        ("company", {"company": "ACME", "min_experience": 3}, {0, 3, 5}),
+        ("skill", {"skills": ["spark"]}, {1}),
+        ("phrase", {"keywords": ["machine learning models"]}, {0, 1, 2, 5}),
+        ("phrase", {"keywords": ["fraud", "language models"]}, set()),
+        ("phrase", {"keywords": ["large language models for"]}, set()),
+        ("degree_experience", {"degree": "master's", "min_experience": 2, "max_experience": 5}, {0, 1, 3}),
+        ("degree", {"degree": "PhD"}, {2}),
+        ("experience", {"max_experience": 1}, {4}),
+        (None, {}, {0, 1, 2, 3, 4, 5}),
+    ],
+)
+def test_index_matches_brute_force(kind, fields, expected_jobs):
+    search = SavedSearch(1, "search", **fields)
+    assert search.anchor()[0] == kind
+
+    expected = {(1, JOBS[i]["Job URL"]) for i in expected_jobs}
+    assert brute_force([search], JOBS) == expected
+    assert indexed([search], JOBS) == expected
+
+
+def test_mixed_searches_match_brute_force():
+    searches = [
+        SavedSearch(1, "company", company="Globex"),
+        SavedSearch(2, "skills", skills=["Python", "SQL"], max_experience=3),
+        SavedSearch(3, "phrase", keywords=["nlp researcher"]),
+        SavedSearch(4, "degree and years", degree="Bachelor's", min_experience=0, max_experience=2),
+        SavedSearch(5, "degree", degree="Master's", keywords=["fraud detection"]),
+        SavedSearch(6, "years", min_experience=6),
+        SavedSearch(7, "everything"),
+    ]
+    assert indexed(searches, JOBS) == brute_force(searches, JOBS)
+    assert len(brute_force(searches, JOBS)) > len(JOBS)
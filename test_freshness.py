@@ -0,0 +1,103 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from freshness import pick_jobs_to_verify, run_verification_cycle
+from job_store import CLOSED_COLUMN
+from stand_in_server import start_stand_in_server
+
+"""
+Freshness checks against the local stand-in for LinkedIn job pages (see stand_in_server.py).
+"""
+
+KINDS = ["live", "closed", "gone", "expired", "moved"]
+
+
+@pytest.fixture
+def server():
+    server, base_url = start_stand_in_server()
+    server.base_url = base_url
+    yield server
+    server.shutdown()
+
+
+def write_jobs(server, kinds, csv_file="job_listings.csv"):
+    urls = [f"{server.base_url}/jobs/view/{kind}-{i}" for i, kind in enumerate(kinds)]
+    pd.DataFrame(
+        {
+            "Job Title": [f"Data Scientist {i}" for i in range(len(kinds))],
+            "Company": "Stand-in",
+            "Location (IL)": "Israel",
+            "Required Degree": "Not Specified",
+            "Required Experience (years)": "Not Specified",
+            "Job URL": urls,
+            "Date Retrieved": [f"2026-01-0{i + 1} 12:00:00" for i in range(len(kinds))],
+        }
+    ).to_csv(csv_file, index=False)
+    return urls
+
+
+def closed_dates(csv_file="job_listings.csv"):
+    df = pd.read_csv(csv_file)
+    # The column is only added once a posting is found closed
+    if CLOSED_COLUMN not in df.columns:
+        return dict.fromkeys(df["Job URL"])
+    return dict(zip(df["Job URL"], df[CLOSED_COLUMN]))
+
+
+def test_closed_postings_are_marked(server, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    urls = dict(zip(KINDS, write_jobs(server, KINDS)))
+
+    results = run_verification_cycle(budget=len(KINDS), delay=None)
+
+    assert results == {"live": 2, "closed": 3, "unknown": 0}
+    closed = closed_dates()
+    for kind in ("live", "moved"):
+        assert pd.isna(closed[urls[kind]])
+    for kind in ("closed", "gone", "expired"):
+        assert not pd.isna(closed[urls[kind]])
+
+
+def test_second_cycle_revalidates_with_etag(server, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    live_url = write_jobs(server, ["live"])[0]
+    live_path = live_url[len(server.base_url):]
+
+    run_verification_cycle(budget=1, delay=None)
+    run_verification_cycle(budget=1, delay=None)
+
+    first, second = [headers for path, headers in server.requests if path == live_path]
+    assert "If-None-Match" not in first
+    assert second["If-None-Match"] == '"live-0"'
+    assert [code for path, code in server.responses if path == live_path] == [200, 304]
+    assert pd.isna(closed_dates()[live_url])
+
+
+def test_budget_limits_requests(server, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_jobs(server, KINDS)
+
+    run_verification_cycle(budget=2, delay=None)
+
+    assert len(server.requests) == 2
+
+
+def test_older_and_watched_postings_first():
+    now = datetime(2026, 1, 10, 12, 0, 0)
+    jobs = [
+        ("new", "2026-01-10 00:00:00"),
+        ("old", "2026-01-01 12:00:00"),
+        ("watched", "2026-01-08 12:00:00"),
+        ("checked", "2026-01-01 12:00:00"),
+    ]
+    # Recently checked postings wait, whatever their retrieval date
+    state = {"checked": {"checked_at": "2026-01-10 11:00:00"}}
+    interest = {"watched": 9}
+
+    ranked = pick_jobs_to_verify(jobs, state, interest, budget=4, now=now)
+
+    # watched: 48h x 10, old: 216h, new: 12h, checked: 1h
+    assert ranked == ["watched", "old", "new", "checked"]
+    assert pick_jobs_to_verify(jobs, state, interest, budget=2, now=now) == ["watched", "old"]
@@ -0,0 +1,115 @@
+import csv
+import os
+
+import pandas as pd
+import pytest
+
+from find_jobs import save_new_jobs
+from rollups import JobRollups, update_rollups, verify_rollups
+
+"""
+The incremental rollups must always agree with a full recompute from the CSV.
+Batches go through save_new_jobs, the save step of run_job_finder_and_save.
+"""
+
+
+def make_jobs(ids, run_time):
+    return pd.DataFrame(
+        {
+            "Job Title": [f"Data Scientist {i}" for i in ids],
+            "Company": [f"Company {i % 3}" for i in ids],
+            "Location (IL)": ["Tel Aviv" if i % 2 else None for i in ids],
+            "Required Degree": ["Master's" if i % 4 else "Not Specified" for i in ids],
+            "Required Experience (years)": [str(i % 8) if i % 5 else "Not Specified" for i in ids],
+            "Job URL": [f"https://il.linkedin.com/jobs/view/{i}" for i in ids],
+            "Date Retrieved": run_time,
+        }
+    )
+
+
+def ingest(jobs_df, run_time, files):
+    csv_file, rollups_file, snapshot_dir, descriptions_file = files
+    added_df = save_new_jobs(
+        jobs_df, run_time, {}, csv_file,
+        rollups_file=rollups_file, snapshot_dir=snapshot_dir, descriptions_file=descriptions_file,
+    )
+    return len(added_df)
+
+
+@pytest.fixture
+def files(tmp_path):
+    return (
+        str(tmp_path / "job_listings.csv"),
+        str(tmp_path / "job_rollups.json"),
+        str(tmp_path / "job_snapshot"),
+        str(tmp_path / "job_descriptions.jsonl"),
+    )
+
+
+def assert_matches_recompute(csv_file, rollups_file):
+    assert verify_rollups(rollups_file, csv_file) == []
+    rollups = JobRollups.load(rollups_file)
+    from_dataframe = JobRollups.from_dataframe(pd.read_csv(csv_file))
+    with open(csv_file, "r", newline="", encoding="utf-8") as f:
+        from_records = JobRollups.from_records(csv.DictReader(f))
+    for expected in (from_dataframe, from_records):
+        assert rollups.total_jobs == expected.total_jobs
+        assert rollups.counts == expected.counts
+        # Runs that found nothing leave no rows behind
+        assert [run for run in rollups.runs if run["new_jobs"]] == expected.runs
+
+
+def test_batches_match_full_recompute(files):
+    csv_file, rollups_file = files[:2]
+    batches = [
+        (make_jobs(range(0, 10), "2026-01-01 08:00:00"), 10),
+        (make_jobs([], "2026-01-01 20:00:00"), 0),
+        # Overlaps the first batch and repeats a URL within the batch
+        (make_jobs([5, 6, 10, 11, 11, 12], "2026-01-02 08:00:00"), 3),
+        (make_jobs(range(0, 13), "2026-01-02 20:00:00"), 0),
+        (make_jobs(range(13, 40), "2026-01-03 08:00:00"), 27),
+    ]
+    for jobs_df, expected_new in batches:
+        run_time = jobs_df["Date Retrieved"].iloc[0] if len(jobs_df) else "2026-01-01 20:00:00"
+        assert ingest(jobs_df, run_time, files) == expected_new
+        assert_matches_recompute(csv_file, rollups_file)
+    assert JobRollups.load(rollups_file).total_jobs == 40
+
+
+def test_bootstrap_after_csv_write_counts_run_once(files):
+    csv_file, rollups_file = files[:2]
+    ingest(make_jobs(range(0, 5), "2026-01-01 08:00:00"), "2026-01-01 08:00:00", files)
+    # Rollups lost, the next run bootstraps them from a CSV that already holds its jobs
+    os.remove(rollups_file)
+    ingest(make_jobs(range(5, 8), "2026-01-02 08:00:00"), "2026-01-02 08:00:00", files)
+    assert JobRollups.load(rollups_file).total_jobs == 8
+    assert_matches_recompute(csv_file, rollups_file)
+
+
+def test_run_recorded_twice_is_counted_once(files):
+    csv_file, rollups_file = files[:2]
+    jobs_df = make_jobs(range(0, 5), "2026-01-01 08:00:00")
+    ingest(jobs_df, "2026-01-01 08:00:00", files)
+    update_rollups(jobs_df, "2026-01-01 08:00:00", rollups_file, csv_file)
+    assert JobRollups.load(rollups_file).total_jobs == 5
+    assert_matches_recompute(csv_file, rollups_file)
+
+
+def test_failed_csv_write_leaves_rollups_unchanged(files, monkeypatch):
+    csv_file, rollups_file = files[:2]
+    ingest(make_jobs(range(0, 5), "2026-01-01 08:00:00"), "2026-01-01 08:00:00", files)
+
+    def fail_to_csv(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(pd.DataFrame, "to_csv", fail_to_csv)
+    with pytest.raises(OSError):
+        ingest(make_jobs(range(5, 8), "2026-01-02 08:00:00"), "2026-01-02 08:00:00", files)
+    monkeypatch.undo()
+    assert JobRollups.load(rollups_file).total_jobs == 5
+    assert_matches_recompute(csv_file, rollups_file)
+
+    # The retry counts the jobs once
+    ingest(make_jobs(range(5, 8), "2026-01-02 09:00:00"), "2026-01-02 09:00:00", files)
+    assert JobRollups.load(rollups_file).total_jobs == 8
+    assert_matches_recompute(csv_file, rollups_file)
@@ -1,12 +1,27 @@
-from flask import Flask, render_template_string, send_file, jsonify
-import pandas as pd
+from flask import Flask, request, make_response, send_file, jsonify
+import argparse
+import hashlib
 import os
+import threading
+import zlib
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from scheduler import JobFinderScheduler
+from scheduler import load_schedule
+from job_store import load_job_store
+from rollups import load_rollups, ROLLUPS_FILE
 
 app = Flask(__name__)
 
-scheduler = JobFinderScheduler(interval=12)
+# Scrape interval (hours) until the scheduler has saved its adaptive one
+INTERVAL = 12
+# JobFinderScheduler, created by start_server unless the dashboard is read-only
+scheduler = None
+# Read-only dashboards never write the snapshot or rollups, the scraping instance owns them
+READ_ONLY = os.environ.get("JOBFINDER_READ_ONLY") == "1"
+# Memory-mapped job snapshot, reopened only when a new snapshot is written
+job_store = None
+# Rollups JSON for /api/stats, reloaded only when the file changes
+stats_cache = {"mtime": None, "stats": None}
 
 HTML_TEMPLATE = """
 <!DOCTYPE html>
@@ -36,6 +51,9 @@ HTML_TEMPLATE = """
         .info_box p:first-child {
             margin-top: 0;
         }
+        .info_box form {
+            margin: 5px 0;
+        }
         .download_button {
             background-color: #2f2fa3;
             color: white;
@@ -65,6 +83,42 @@ HTML_TEMPLATE = """
         tr:hover {
             background-color: #f1f1f1;
         }
+        .stats_panel {
+            display: flex;
+            flex-wrap: wrap;
+            justify-content: center;
+            width: 85%;
+            margin: 10px auto;
+        }
+        .chart {
+            background: white;
+            padding: 10px;
+            margin: 5px;
+            width: 280px;
+            border-radius: 8px;
+        }
+        .chart h3 {
+            margin: 0 0 8px 0;
+            color: #181899;
+            font-size: 14px;
+        }
+        .bar_row {
+            display: flex;
+            align-items: center;
+            font-size: 12px;
+            margin: 2px 0;
+        }
+        .bar_label {
+            width: 110px;
+            overflow: hidden;
+            white-space: nowrap;
+            text-overflow: ellipsis;
+        }
+        .bar {
+            background-color: #2f2fa3;
+            height: 10px;
+            margin: 0 5px;
+        }
     </style>
 </head>
 <body>
@@ -75,36 +129,32 @@ HTML_TEMPLATE = """
         <p><strong>Last Updated:</strong> {{ last_update }}</p>
         <p><strong>Next Update:</strong> <span id="next_update_time">{{ next_run_time }}</span></p>
         <p><strong>Countdown to next update:</strong> <span id="countdown">Loading...</span></p>
+        <form method="get" action="/">
+            <label for="skill"><strong>Filter by skill:</strong></label>
+            <select name="skill" id="skill" onchange="this.form.submit()">
+                <option value="">All skills</option>
+                {% for name, count in skills %}
+                <option value="{{ name }}" {% if name == skill %}selected{% endif %}>{{ name }} ({{ count }})</option>
+                {% endfor %}
+            </select>
+            {% if show_closed %}<input type="hidden" name="show_closed" value="1">{% endif %}
+            {% if skill %}<span>Showing {{ shown_jobs }} jobs</span>{% endif %}
+        </form>
+        {% if closed_jobs > 0 %}
+        <p><strong>Closed Jobs:</strong> {{ closed_jobs }}
+            {% if show_closed %}
+            (<a href="/{% if skill %}?skill={{ skill|urlencode }}{% endif %}">hide</a>)
+            {% else %}
+            hidden (<a href="/?show_closed=1{% if skill %}&skill={{ skill|urlencode }}{% endif %}">show</a>)
+            {% endif %}
+        </p>
+        {% endif %}
         <div style="text-align: center; margin-top: 10px;">
             <a class="download_button" href="/download">Download CSV</a>
         </div>
     </div>
-    {% if jobs|length > 0 %}
-    <table>
-        <tr>
-            <th>Job Title</th>
-            <th>Company</th>
-            <th>Location</th>
-            <th>Degree</th>
-            <th>Experience</th>
-            <th>Link</th>
-            <th>Date Retrieved</th>
-        </tr>
-        {% for job in jobs %}
-        <tr>
-            <td>{{ job['Job Title'] }}</td>
-            <td>{{ job['Company'] }}</td>
-            <td>{{ job['Location (IL)'] }}</td>
-            <td>{{ job['Required Degree'] }}</td>
-            <td>{{ job['Required Experience (years)'] }}</td>
-            <td><a href="{{ job['Job URL'] }}" target="_blank">View Job</a></td>
-            <td>{{ job['Date Retrieved'] }}</td>
-        </tr>
-        {% endfor %}
-    </table>
-    {% else %}
-    <p style="text-align: center;">No job listings available.</p>
-    {% endif %}
+    <div class="stats_panel" id="stats_panel"></div>
+    {{ jobs_table|safe }}
     
     <script>
     function updateCountdown() {
@@ -136,35 +186,120 @@ HTML_TEMPLATE = """
     
     setInterval(updateCountdown, 1000);
     updateCountdown();
+
+    function topEntries(counts, limit) {
+        return Object.entries(counts).sort((a, b) => b[1] - a[1]).slice(0, limit);
+    }
+
+    function addChart(title, entries) {
+        // Horizontal bar chart of [label, count] entries
+        let max = Math.max(1, ...entries.map(entry => entry[1]));
+        let chart = document.createElement('div');
+        chart.className = 'chart';
+        let heading = document.createElement('h3');
+        heading.textContent = title;
+        chart.appendChild(heading);
+        for (let [label, count] of entries) {
+            let row = document.createElement('div');
+            row.className = 'bar_row';
+            let name = document.createElement('span');
+            name.className = 'bar_label';
+            name.textContent = label;
+            name.title = label;
+            let bar = document.createElement('span');
+            bar.className = 'bar';
+            bar.style.width = Math.max(2, 120 * count / max) + 'px';
+            let value = document.createElement('span');
+            value.textContent = count;
+            row.append(name, bar, value);
+            chart.appendChild(row);
+        }
+        document.getElementById('stats_panel').appendChild(chart);
+    }
+
+    fetch('/api/stats')
+        .then(response => response.json())
+        .then(stats => {
+            addChart('Top companies', topEntries(stats.counts.company, 10));
+            addChart('Locations', topEntries(stats.counts.location, 10));
+            addChart('Required degree', topEntries(stats.counts.degree, 10));
+            addChart('Experience (years)', topEntries(stats.counts.experience, 10));
+            // Runs stay in time order
+            addChart('New jobs per run (last 10)', stats.runs.slice(-10).map(run => [run.run, run.new_jobs]));
+        })
+        .catch(error => console.error('Error fetching stats:', error));
 </script>
 </body>
 </html>
 """
 
+TABLE_TEMPLATE = """
+    {% if total_jobs > 0 %}
+    <table>
+        <tr>
+            <th>Job Title</th>
+            <th>Company</th>
+            <th>Location</th>
+            <th>Degree</th>
+            <th>Experience</th>
+            <th>Skills</th>
+            <th>Link</th>
+            <th>Date Retrieved</th>
+            {% if show_closed %}<th>Date Closed</th>{% endif %}
+        </tr>
+        {% for job in jobs %}
+        <tr>
+            <td>{{ job['Job Title'] }}</td>
+            <td>{{ job['Company'] }}</td>
+            <td>{{ job['Location (IL)'] }}</td>
+            <td>{{ job['Required Degree'] }}</td>
+            <td>{{ job['Required Experience (years)'] }}</td>
+            <td>{{ job['Skills'] }}</td>
+            <td><a href="{{ job['Job URL'] }}" target="_blank">View Job</a></td>
+            <td>{{ job['Date Retrieved'] }}</td>
+            {% if show_closed %}<td>{{ job['Date Closed'] }}</td>{% endif %}
+        </tr>
+        {% endfor %}
+    </table>
+    {% else %}
+    <p style="text-align: center;">No job listings available.</p>
+    {% endif %}
+"""
+
+# Templates are compiled once at startup
+page_template = app.jinja_env.from_string(HTML_TEMPLATE)
+table_template = app.jinja_env.from_string(TABLE_TEMPLATE)
+
+# Latest rendered table + stats and full page per (skill, show_closed) filter, least recently used dropped first.
+# The table html is kept once in table_cache, pages only keep their gzip body and the html around the table.
+# cache_lock only guards the dicts, rendering happens outside it with one lock per table being rendered
+MAX_CACHED_FILTERS = 4
+# Stands in for the table while rendering the page, which is then split around it
+TABLE_MARKER = "<!--jobs-table-->"
+cache_lock = threading.Lock()
+table_cache = OrderedDict()
+page_cache = OrderedDict()
+render_locks = {}
+
 
 @app.route("/")
 def index():
     """
     Display job listings and stats
     """
+    global job_store
     csv_file = "job_listings.csv"
     last_run_file = "last_run.txt"
 
-    if os.path.exists(csv_file):
-        df = pd.read_csv(csv_file)
-        jobs = df.to_dict(orient="records")
-        total_jobs = len(df)
-        unique_companies = df["Company"].nunique()
-
-        if "Date Retrieved" in df.columns and len(df) > 0:
-            csv_last_update = pd.to_datetime(df["Date Retrieved"]).max().strftime("%Y-%m-%d %H:%M:%S")
-        else:
-            csv_last_update = "N/A"
-    else:
-        jobs = []
-        total_jobs = 0
-        unique_companies = 0
-        csv_last_update = "N/A"
+    job_store = load_job_store(csv_file, current=job_store, persist=not READ_ONLY)
+    skill = request.args.get("skill") or None
+    if job_store is None or skill not in job_store.categories["skill"]:
+        skill = None
+    # Postings found closed by the freshness checks are hidden unless asked for
+    show_closed = request.args.get("show_closed") == "1"
+    table = get_table_fragment(job_store, skill, show_closed)
+    csv_last_update = table["csv_last_update"]
+    schedule = load_schedule()
     
     # Check for last run time (even if no new jobs were found)
     if os.path.exists(last_run_file):
@@ -174,7 +309,7 @@ def index():
             last_update = last_run_dt.strftime("%Y-%m-%d %H:%M:%S")
             
             # Calculate next run based on actual last run
-            next_run_actual = last_run_dt + timedelta(hours=scheduler.interval)
+            next_run_actual = last_run_dt + timedelta(hours=get_interval(schedule))
             next_run_time = next_run_actual.strftime("%Y-%m-%d %H:%M:%S")
     else:
         # use if last_run.txt doesn't exist
@@ -183,19 +318,185 @@ def index():
         # Calculate next run from CSV if available
         if csv_last_update != "N/A":
             last_update_dt = datetime.strptime(csv_last_update, "%Y-%m-%d %H:%M:%S")
-            next_run_actual = last_update_dt + timedelta(hours=scheduler.interval)
+            next_run_actual = last_update_dt + timedelta(hours=get_interval(schedule))
             next_run_time = next_run_actual.strftime("%Y-%m-%d %H:%M:%S")
         else:
             next_run_time = "N/A"
 
-    return render_template_string(
-        HTML_TEMPLATE,
-        jobs=jobs,
-        total_jobs=total_jobs,
-        unique_companies=unique_companies,
+    # The scheduler adapts its interval, its persisted next run wins over the estimate above
+    if schedule and schedule["next_run"]:
+        next_run_time = schedule["next_run"].strftime("%Y-%m-%d %H:%M:%S")
+
+    page = get_page(table, last_update, next_run_time)
+    # Quality, so "gzip;q=0" counts as refused
+    use_gzip = request.accept_encodings["gzip"] > 0
+    if use_gzip:
+        body = page["gzip"]
+    else:
+        # Rare, most clients take gzip
+        body = b"".join((page["prefix"], table["html"], page["suffix"]))
+    response = make_response(body)
+    response.mimetype = "text/html"
+    if use_gzip:
+        response.headers["Content-Encoding"] = "gzip"
+    response.headers["Vary"] = "Accept-Encoding"
+    response.set_etag(page["etag"] + ("-gz" if use_gzip else ""))
+    # Returns 304 when the browser already has this version
+    return response.make_conditional(request)
+
+
+def get_interval(schedule):
+    """
+    Current scrape interval in hours
+
+    :param schedule: Persisted schedule from load_schedule (or None)
+    """
+    if scheduler is not None:
+        return scheduler.interval
+    if schedule:
+        return schedule["interval"]
+    return INTERVAL
+
+
+def get_table_fragment(store, skill=None, show_closed=False):
+    """
+    Render the jobs table once per data version and filter.
+    While a new version is being rendered, other requests get the previous table instead of waiting.
+
+    :param store: JobStore or None
+    :param skill: Only show jobs tagged with this skill (None for all jobs)
+    :param show_closed: Include postings marked closed
+    :return: dict with version, skill, show_closed, html, shown_jobs, closed_jobs, total_jobs,
+        unique_companies, csv_last_update and skills
+    """
+    version = store.version if store is not None else 0
+    key = (version, skill, show_closed)
+    with cache_lock:
+        previous = table_cache.get((skill, show_closed))
+        if previous is not None:
+            table_cache.move_to_end((skill, show_closed))
+            if previous["version"] == version:
+                return previous
+        render_lock = render_locks.setdefault(key, threading.Lock())
+
+    if not render_lock.acquire(blocking=False):
+        if previous is not None:
+            return previous
+        # Nothing to show yet, wait for the render in progress
+        render_lock.acquire()
+    try:
+        with cache_lock:
+            fragment = table_cache.get((skill, show_closed))
+        if fragment is not None and fragment["version"] == version:
+            return fragment
+        fragment = render_table_fragment(store, skill, show_closed)
+        with cache_lock:
+            # Replaced rather than mutated, so requests holding the old fragment are unaffected
+            current = table_cache.get((skill, show_closed))
+            if current is None or current["version"] <= version:
+                cache_put(table_cache, (skill, show_closed), fragment)
+        return fragment
+    finally:
+        render_lock.release()
+        with cache_lock:
+            render_locks.pop(key, None)
+
+
+def render_table_fragment(store, skill=None, show_closed=False):
+    """
+    Render the jobs table and collect the info box stats, see get_table_fragment
+    """
+    if store is None:
+        return {
+            "version": 0,
+            "skill": None,
+            "show_closed": show_closed,
+            "html": table_template.render(jobs=[], total_jobs=0, show_closed=show_closed).encode("utf-8"),
+            "shown_jobs": 0,
+            "closed_jobs": 0,
+            "total_jobs": 0,
+            "unique_companies": 0,
+            "csv_last_update": "N/A",
+            "skills": [],
+        }
+    rows = store.select_rows(skill, include_closed=show_closed)
+    shown_jobs = len(store) if rows is None else len(rows)
+    # Rows are decoded lazily while the template renders
+    return {
+        "version": store.version,
+        "skill": skill,
+        "show_closed": show_closed,
+        "html": table_template.render(
+            jobs=store.iter_rows(rows=rows), total_jobs=shown_jobs, show_closed=show_closed
+        ).encode("utf-8"),
+        "shown_jobs": shown_jobs,
+        "closed_jobs": store.closed_count(),
+        "total_jobs": len(store),
+        "unique_companies": store.unique_count("Company"),
+        "csv_last_update": store.last_retrieved(),
+        "skills": list(store.skill_counts().items()),
+    }
+
+
+def cache_put(cache, key, value):
+    """
+    Store in an LRU cache, dropping the least recently used filters. Call with cache_lock held
+    """
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > MAX_CACHED_FILTERS:
+        cache.popitem(last=False)
+
+
+def get_page(table, last_update, next_run_time):
+    """
+    Render the full page around the cached table, reusing the last page if nothing changed
+
+    :param table: Fragment returned by get_table_fragment
+    :param last_update: Last update string for the info box
+    :param next_run_time: Next run string for the info box
+    :return: dict with prefix and suffix (page html before and after the table), gzip (compressed page) and etag
+    """
+    key = (table["version"], table["skill"], table["show_closed"], last_update, next_run_time)
+    with cache_lock:
+        page = page_cache.get((table["skill"], table["show_closed"]))
+        if page is not None:
+            page_cache.move_to_end((table["skill"], table["show_closed"]))
+    if page is not None and page["key"] == key:
+        return page
+
+    # Rendered and compressed outside the lock, cached pages keep being served meanwhile
+    html = page_template.render(
+        jobs_table=TABLE_MARKER,
+        total_jobs=table["total_jobs"],
+        unique_companies=table["unique_companies"],
         last_update=last_update,
         next_run_time=next_run_time,
+        skills=table["skills"],
+        skill=table["skill"],
+        shown_jobs=table["shown_jobs"],
+        show_closed=table["show_closed"],
+        closed_jobs=table["closed_jobs"],
+    )
+    prefix, suffix = (part.encode("utf-8") for part in html.split(TABLE_MARKER, 1))
+    # Compressed piece by piece, so the page is never joined into one html string
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    compressed = b"".join(
+        [compressor.compress(prefix), compressor.compress(table["html"]), compressor.compress(suffix), compressor.flush()]
     )
+    page = {
+        "key": key,
+        "prefix": prefix,
+        "suffix": suffix,
+        "gzip": compressed,
+        "etag": hashlib.md5(repr(key).encode("utf-8")).hexdigest(),
+    }
+    with cache_lock:
+        current = page_cache.get((table["skill"], table["show_closed"]))
+        # A request still holding an older table must not replace a newer page
+        if current is None or current["key"][0] <= table["version"]:
+            cache_put(page_cache, (table["skill"], table["show_closed"]), page)
+    return page
 
 
 @app.route("/download")
@@ -220,38 +521,67 @@ def api_next_run():
     """
     Return time to next run in seconds
     """
+    global job_store
     last_run_file = "last_run.txt"
     csv_file = "job_listings.csv"
     
-    # Try to get last run from file first (most accurate)
+    # Adaptive schedule written by the scheduler
+    schedule = load_schedule()
+    if schedule and schedule["next_run"]:
+        seconds = int((schedule["next_run"] - datetime.now()).total_seconds())
+        return jsonify({"seconds_to_next_run": seconds})
+    
+    # Otherwise estimate from the last run, try the file first (most accurate)
     if os.path.exists(last_run_file):
         with open(last_run_file, 'r') as f:
             last_run_str = f.read().strip()
             last_update_dt = datetime.fromisoformat(last_run_str)
-    # use CSV if file doesn't exist
-    elif os.path.exists(csv_file):
-        df = pd.read_csv(csv_file)
-        if "Date Retrieved" in df.columns and len(df) > 0:
-            last_update_dt = pd.to_datetime(df["Date Retrieved"]).max()
-        else:
-            return jsonify({"seconds_to_next_run": 0})
+    # use CSV data if file doesn't exist
     else:
-        return jsonify({"seconds_to_next_run": 0})
+        job_store = load_job_store(csv_file, current=job_store, persist=not READ_ONLY)
+        if job_store is None or job_store.last_retrieved() == "N/A":
+            return jsonify({"seconds_to_next_run": 0})
+        last_update_dt = datetime.strptime(job_store.last_retrieved(), "%Y-%m-%d %H:%M:%S")
     
     # Calculate next run
-    next_run_actual = last_update_dt + timedelta(hours=scheduler.interval)
+    next_run_actual = last_update_dt + timedelta(hours=get_interval(schedule))
     time_until = next_run_actual - datetime.now()
     seconds = int(time_until.total_seconds())
     
     return jsonify({"seconds_to_next_run": seconds})
 
 
-def start_server(port=5000):
+@app.route("/api/stats")
+def api_stats():
+    """
+    Return the job rollups (counts per company, location, degree, experience bucket, day and new jobs per run)
+    """
+    mtime = os.path.getmtime(ROLLUPS_FILE) if os.path.exists(ROLLUPS_FILE) else None
+    if stats_cache["stats"] is None or stats_cache["mtime"] != mtime:
+        stats_cache["stats"] = load_rollups(persist=not READ_ONLY).to_dict()
+        stats_cache["mtime"] = os.path.getmtime(ROLLUPS_FILE) if os.path.exists(ROLLUPS_FILE) else None
+    return jsonify(stats_cache["stats"])
+
+
+def start_server(port=5000, read_only=False):
     """
     Start the Flask web server
+
+    :param port: Port to listen on
+    :param read_only: Only serve the dashboard from the stored data, without scheduling scraper runs
     """
+    global scheduler, READ_ONLY
+    READ_ONLY = read_only
+    if read_only:
+        print("Read-only mode, the scraper is not scheduled")
+        app.run(host="0.0.0.0", port=port, debug=False, use_reloader=False)
+        return
+
+    # Imported here so read-only dashboards never load APScheduler or the scraper
+    from scheduler import JobFinderScheduler
+
+    scheduler = JobFinderScheduler(interval=INTERVAL)
     csv_file = "job_listings.csv"
-    run_rn = not os.path.exists(csv_file)
     last_run_file = "last_run.txt"
     run_rn = False
     if not os.path.exists(csv_file):
@@ -275,4 +605,9 @@ def start_server(port=5000):
 
 
 if __name__ == "__main__":
-    start_server(port=5000)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Job listings dashboard")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--read-only", action="store_true",
+                        help="Serve the stored jobs without running the scraper (also JOBFINDER_READ_ONLY=1)")
+    args = parser.parse_args()
+    start_server(port=args.port, read_only=args.read_only or READ_ONLY)